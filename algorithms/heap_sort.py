@@ -0,0 +1,6 @@
+from visualization.array_visualizer import ArrayAlgorithmVisualizer
+
+class HeapSortVisualizer(ArrayAlgorithmVisualizer):
+    tab_title = "Heap Sort"
+    tab_order = 50
+    algorithm = 'heap'
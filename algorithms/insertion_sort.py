@@ -1,116 +1,109 @@
-import tkinter as tk
-from tkinter import ttk
-import time
-import random
-from visualization.visualizer import AlgorithmVisualizer
+import logging
+from visualization.array_visualizer import ArrayAlgorithmVisualizer
+from algorithms.steps import COMPARE, SHIFT, WRITE, SELECT, SORTED, BLOCK_SHIFT
+from engine.counting import count_operations
+
+class InsertionSortVisualizer(ArrayAlgorithmVisualizer):
+    tab_title = "Insertion Sort"
+    tab_order = 20
+    variants = {
+        'Linear scan': 'insertion',
+        'Binary search': 'insertion_binary',
+        'Block shift': 'insertion_block',
+        'Shell gaps': 'shell',
+    }
+
+    # After a run every variant is counted on the same input, up to this
+    # many values; the linear scan takes about n^2 / 2 steps
+    MAX_COMPARED = 3000
 
-class InsertionSortVisualizer(AlgorithmVisualizer):
     def __init__(self, parent):
+        self.counting = None
+        self.compared = None    # (input, counts) of the last comparison
         super().__init__(parent)
-        
-        # Add array size control
-        ttk.Label(self.control_frame, text="Array Size:").pack(side=tk.LEFT, padx=5, pady=5)
-        self.size_var = tk.IntVar(value=15)
-        self.size_spinbox = ttk.Spinbox(self.control_frame, from_=5, to=50, 
-                                        textvariable=self.size_var, width=5)
-        self.size_spinbox.pack(side=tk.LEFT, padx=5, pady=5)
-        
-        # Generate new data button
-        ttk.Button(self.control_frame, text="New Data", 
-                  command=self.setup_data).pack(side=tk.LEFT, padx=5, pady=5)
-        
-        # Initialize the array and visualization
-        self.setup_data()
-        self.fig, self.ax = self.setup_canvas()
-        self.update_visualization()
-    
-    def get_title(self):
-        return "Insertion Sort Visualization"
-    
-    def setup_data(self):
-        # Generate random array
-        size = self.size_var.get()
-        self.array = [random.randint(1, 10) for _ in range(size)]
-        self.colors = ['#CCCCCC'] * len(self.array)  # Default color
-        self.clear_log()
-        self.log(f"Generated new array: {self.array}")
-        if hasattr(self, 'ax'):
-            self.update_visualization()
-    
-    def update_visualization(self):
-        self.ax.clear()
-        
-        # Create bar chart
-        bars = self.ax.bar(range(len(self.array)), self.array, color=self.colors)
-        
-        # Set plot properties
-        self.ax.set_title("Insertion Sort")
-        self.ax.set_xlabel("Index")
-        self.ax.set_ylabel("Value")
-        self.ax.set_xticks(range(len(self.array)))
-        self.ax.set_xticklabels(range(len(self.array)))
-        self.ax.set_ylim(0, max(self.array) * 1.1)
-        
-        # Update the canvas
-        self.canvas.draw()
-    
-    def start(self):
-        self.insertion_sort()
-    
-    def insertion_sort(self):
-        n = len(self.array)
-        
-        self.log("Starting Insertion Sort")
-        
-        # First element is already sorted
-        self.colors[0] = '#00AA00'  # Green for sorted
-        self.update_visualization()
-        time.sleep(0.5 / self.speed_var.get())
-        
-        # Start from the second element
-        for i in range(1, n):
-            # Key to be inserted
-            key = self.array[i]
-            
+
+    def apply_step(self, event):
+        op, a, b = event
+        if op == SELECT:
             # Highlight current element being inserted
-            self.colors = ['#00AA00'] * i + ['#CCCCCC'] * (n - i)
-            self.colors[i] = '#FF7700'  # Orange for current key
-            self.update_visualization()
-            self.log(f"Inserting element {key} at position {i}")
-            time.sleep(0.5 / self.speed_var.get())
-            
-            # Move elements of arr[0..i-1] that are greater than key 
-            # to one position ahead of their current position
-            j = i - 1
-            while j >= 0 and self.array[j] > key:
-                # Highlight comparison
-                self.colors[j] = '#FF0000'  # Red for element being compared
-                self.update_visualization()
-                time.sleep(0.3 / self.speed_var.get())
-                
-                # Move the element
-                self.array[j + 1] = self.array[j]
-                
-                # Log the swap
-                self.log(f"Moving {self.array[j]} from position {j} to {j+1}")
-                
-                # Update visualization after move
-                self.colors = ['#00AA00'] * i + ['#CCCCCC'] * (n - i)
-                self.colors[j + 1] = '#FF0000'  # Red for moved element
-                self.update_visualization()
-                time.sleep(0.3 / self.speed_var.get())
-                
-                j -= 1
-            
+            self.highlight(a, self.CURRENT)  # Orange for current key
+            if self.log_enabled():
+                self.log(f"Inserting element {self.array[a]} at position {a}")
+        elif op == COMPARE:
+            self.highlight(a, self.MOVED)  # Red for element being compared
+            if self.log_enabled(logging.DEBUG):
+                self.log(f"Comparing {self.array[a]} at position {a} with the key", logging.DEBUG)
+        elif op == SHIFT:
+            self.array[b] = self.array[a]
+            self.highlight(b, self.MOVED)  # Red for moved element
+            if self.log_enabled():
+                self.log(f"Moving {self.array[a]} from position {a} to {b}")
+        elif op == BLOCK_SHIFT:
+            # The whole run moves right at once
+            self.array[a + 1:b + 1] = self.array[a:b]
+            self.highlight_range(a + 1, b + 1, self.MOVED)
+            if self.log_enabled():
+                self.log(f"Moving positions {a} to {b - 1} one place right")
+        elif op == WRITE:
             # Place the key in its correct position
-            self.array[j + 1] = key
-            
+            self.array[a] = b
+            self.highlight(a, self.CURRENT)
+        elif op == SORTED:
             # Update sorted portion
-            self.colors = ['#00AA00'] * (i + 1) + ['#CCCCCC'] * (n - i - 1)
-            self.update_visualization()
-            time.sleep(0.5 / self.speed_var.get())
-        
-        # Show sorted array with all bars in green
-        self.colors = ['#00AA00'] * n  # Green for sorted
-        self.update_visualization()
-        self.log(f"sorted array = {self.array}")
\ No newline at end of file
+            self.mark_sorted(a, b)
+        return True
+
+    def cancel(self):
+        self.counting = None
+        super().cancel()
+
+    def on_finished(self):
+        super().on_finished()
+        self.compare_variants()
+
+    def compare_variants(self):
+        """Count every variant's operations on the input of the finished run
+
+        The counts are taken in worker processes so the tab stays
+        responsive, and logged side by side once all are in.
+        """
+        data = self.trace.data.tolist()
+        if len(data) > self.MAX_COMPARED:
+            self.log(f"Variants are compared on arrays of up to {self.MAX_COMPARED} values")
+            return
+        if self.compared is not None and self.compared[0] == data:
+            self.log_comparison(self.compared[1])
+            return
+        self.counting = (data, [self.submit(count_operations, algorithm, data)
+                                for algorithm in self.variants.values()])
+        self.parent.after(50, self.poll_counts)
+
+    def poll_counts(self):
+        """Log the comparison once every variant has been counted"""
+        if self.counting is None:
+            return
+        data, pending = self.counting
+        if not all(future.done() for future in pending):
+            self.parent.after(50, self.poll_counts)
+            return
+        self.counting = None
+        try:
+            counts = [future.result() for future in pending]
+        except Exception as e:
+            self.log(f"Counting the variants failed: {e!r}", logging.ERROR)
+            self.flush_log()
+            return
+        self.compared = (data, counts)
+        self.log_comparison(counts)
+
+    def log_comparison(self, counts):
+        """Log the counts of every variant, relative to the linear scan"""
+        self.log("Operation counts of every variant on this array:")
+        base = counts[0]
+        for label, row in zip(self.variants, counts):
+            comparisons = row['comparisons'] / max(base['comparisons'], 1)
+            writes = row['writes'] / max(base['writes'], 1)
+            self.log(f"  {label}: {row['comparisons']:,} comparisons ({comparisons:.0%}), "
+                     f"{row['writes']:,} writes ({writes:.0%}), "
+                     f"{row['element_writes']:,} elements written")
+        self.flush_log()
@@ -0,0 +1,10 @@
+from visualization.array_visualizer import ArrayAlgorithmVisualizer
+
+class MergeSortVisualizer(ArrayAlgorithmVisualizer):
+    tab_title = "Merge Sort"
+    tab_order = 30
+    variants = {
+        'Top-down': 'merge',
+        'Bottom-up': 'merge_bottom_up',
+        'Natural runs': 'natural_merge',
+    }
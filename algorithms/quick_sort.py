@@ -0,0 +1,9 @@
+from visualization.array_visualizer import ArrayAlgorithmVisualizer
+
+class QuickSortVisualizer(ArrayAlgorithmVisualizer):
+    tab_title = "Quick Sort"
+    tab_order = 40
+    variants = {
+        'Median of three': 'quick',
+        '3-way partition': 'quick_3way',
+    }
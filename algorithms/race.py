@@ -0,0 +1,292 @@
+import tkinter as tk
+from tkinter import ttk
+import logging
+import math
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from visualization.visualizer import AlgorithmVisualizer
+from visualization.playback import ArrayPlayback
+from engine.cache import TRACES
+from engine.trace import SORTS, record_sort
+from utils.data_generator import DISTRIBUTIONS, generate, new_seed
+
+# Lanes checked when the tab opens
+DEFAULT_ALGORITHMS = ('bubble', 'insertion', 'merge', 'quick')
+DEFAULT_DISTRIBUTIONS = ('random',)
+
+# More lanes than this make the charts too small to follow
+MAX_LANES = 12
+
+class RaceLane(ArrayPlayback):
+    """One run of a race: its replay state, its steps and its chart"""
+
+    def __init__(self, algorithm, distribution, data, trace, renderer):
+        self.algorithm = algorithm
+        self.distribution = distribution
+        self.set_array(data)
+        self.trace = trace
+        self.renderer = renderer
+        self.steps = trace.events()
+        self.shown = 0
+
+    @property
+    def label(self):
+        return f"{self.algorithm} / {self.distribution}"
+
+    def log(self, message, level=logging.INFO):
+        # Per-step messages of several lanes would flood the log
+        pass
+
+    def log_enabled(self, level=logging.INFO):
+        return False
+
+    def advance(self, count):
+        """Apply up to count visible steps
+
+        Returns:
+            bool: False once the lane has finished
+        """
+        shown = 0
+        for event in self.steps:
+            if self.apply_step(event):
+                shown += 1
+                if shown == count:
+                    self.shown += shown
+                    return True
+        self.shown += shown
+        self.steps = None
+        return False
+
+
+class RaceVisualizer(AlgorithmVisualizer):
+    """Several sorts, or one sort on several inputs, racing side by side
+
+    Every checked algorithm runs on every checked input distribution, and
+    all runs of a distribution sort the same array. The runs are recorded
+    concurrently in worker processes, then replayed in lock step: each
+    frame advances every lane by the same number of steps, and all lanes
+    are drawn on one canvas with a single blit.
+    """
+    tab_title = "Race"
+    tab_order = 90
+
+    # Steps every lane takes between clock checks at instant speed
+    INSTANT_BATCH = 256
+
+    def __init__(self, parent):
+        super().__init__(parent)
+        self.lanes = []
+        self.renderers = []
+        self.pending = None
+        self.pool = None
+
+        # Lanes to race: every checked algorithm on every checked input
+        self.algorithm_vars = self.add_check_menu("Algorithms", SORTS, DEFAULT_ALGORITHMS)
+        self.distribution_vars = self.add_check_menu("Inputs", DISTRIBUTIONS,
+                                                     DEFAULT_DISTRIBUTIONS)
+
+        ttk.Label(self.control_frame, text="Array Size:").pack(side=tk.LEFT, padx=5, pady=5)
+        self.size_var = tk.IntVar(value=30)
+        ttk.Spinbox(self.control_frame, from_=5, to=1000, textvariable=self.size_var,
+                    width=5).pack(side=tk.LEFT, padx=5, pady=5)
+        ttk.Label(self.control_frame, text="Seed:").pack(side=tk.LEFT, padx=5, pady=5)
+        self.seed_var = tk.StringVar()
+        ttk.Entry(self.control_frame, textvariable=self.seed_var,
+                  width=10).pack(side=tk.LEFT, padx=5, pady=5)
+        ttk.Button(self.control_frame, text="New Data",
+                   command=self.reset).pack(side=tk.LEFT, padx=5, pady=5)
+
+        self.fig, self.ax = self.setup_canvas()
+        self.setup_data()
+
+    def add_check_menu(self, text, choices, checked):
+        """Drop-down of checkboxes, one per choice
+
+        Returns:
+            dict: BooleanVar of every choice
+        """
+        button = ttk.Menubutton(self.control_frame, text=text)
+        menu = tk.Menu(button, tearoff=False)
+        button['menu'] = menu
+        button.pack(side=tk.LEFT, padx=5, pady=5)
+        variables = {}
+        for choice in choices:
+            variables[choice] = tk.BooleanVar(value=choice in checked)
+            menu.add_checkbutton(label=choice, variable=variables[choice])
+        return variables
+
+    def checked(self, variables):
+        return [choice for choice, var in variables.items() if var.get()]
+
+    def setup_data(self):
+        """Generate one array per checked input and lay out a chart per lane"""
+        self.clear_log()
+        try:
+            seed = int(self.seed_var.get())
+        except ValueError:
+            if self.seed_var.get().strip():
+                self.log(f"Invalid seed {self.seed_var.get()!r}, using a random one",
+                         logging.WARNING)
+            seed = new_seed()
+        size = self.size_var.get()
+        self.inputs = {distribution: generate(distribution, size, seed).tolist()
+                       for distribution in self.checked(self.distribution_vars)}
+        self.runs = [(algorithm, distribution)
+                     for distribution in self.inputs
+                     for algorithm in self.checked(self.algorithm_vars)]
+        if len(self.runs) > MAX_LANES:
+            self.log(f"Racing the first {MAX_LANES} of {len(self.runs)} runs",
+                     logging.WARNING)
+            del self.runs[MAX_LANES:]
+        self.log(f"Generated {size} values per input (seed {seed})")
+        self.lanes = []
+        self.layout_charts()
+
+    def layout_charts(self):
+        """Replace the figure's axes with a grid holding one chart per run"""
+        from visualization.bar_renderer import BarChartRenderer
+
+        for renderer in self.renderers:
+            renderer.disconnect()
+        self.fig.clear()
+        self.renderers = []
+        if not self.runs:
+            self.ax = self.fig.add_subplot()
+            self.ax.set_title("Check at least one algorithm and one input")
+            self.ax.axis('off')
+            self.canvas.draw()
+            return
+
+        cols = math.ceil(math.sqrt(len(self.runs)))
+        rows = math.ceil(len(self.runs) / cols)
+        axes = list(self.fig.subplots(rows, cols, squeeze=False).flat)
+        for ax, (algorithm, distribution) in zip(axes, self.runs):
+            renderer = BarChartRenderer(ax, self.canvas, ArrayPlayback.PALETTE,
+                                        f"{algorithm} / {distribution}", blit=False)
+            # The charts are small, so they only get a few index ticks
+            renderer.MAX_LABELED_TICKS = 0
+            data = self.inputs[distribution]
+            renderer.reset(data, [ArrayPlayback.DEFAULT] * len(data), draw=False)
+            self.renderers.append(renderer)
+        for ax in axes[len(self.runs):]:
+            ax.set_visible(False)
+        self.fig.tight_layout()
+        self.canvas.draw()
+
+    def start(self):
+        self.cancel()
+        if not self.runs:
+            self.log("Nothing to race", logging.WARNING)
+            return
+        if self.lanes:
+            # Race the same data again from the start
+            self.layout_charts()
+
+        # Record every run not seen before concurrently; the workers are
+        # kept for later races
+        self.pending = []
+        recording = 0
+        for algorithm, distribution in self.runs:
+            trace = TRACES.get(TRACES.key(algorithm, self.inputs[distribution]))
+            if trace is None:
+                if self.pool is None:
+                    self.pool = ProcessPoolExecutor()
+                future = self.pool.submit(record_sort, algorithm, self.inputs[distribution])
+                recording += 1
+            else:
+                future = Future()
+                future.set_result(trace)
+            self.pending.append(future)
+        self.log(f"Recording {recording} runs...")
+        self.flush_log()
+        self.parent.after(20, self.poll_recordings)
+
+    def poll_recordings(self):
+        """Start the race once every run has been recorded"""
+        if self.pending is None:
+            return
+        if not all(future.done() for future in self.pending):
+            self.parent.after(20, self.poll_recordings)
+            return
+        traces = [future.result() for future in self.pending]
+        self.pending = None
+
+        self.lanes = []
+        for (algorithm, distribution), trace, renderer in zip(self.runs, traces,
+                                                              self.renderers):
+            TRACES.put(TRACES.key(algorithm, self.inputs[distribution]), trace)
+            lane = RaceLane(algorithm, distribution, self.inputs[distribution], trace,
+                            renderer)
+            counts = trace.counts()
+            self.log(f"{lane.label}: {len(trace)} steps, {counts['compare']} comparisons")
+            self.lanes.append(lane)
+        self.finished = []
+
+        # The lanes hold their own steps; self.steps only marks the race
+        # as running for the scheduler
+        self.run_steps(())
+
+    def advance(self, count=1, deadline=None):
+        """Advance every lane by the same number of visible steps"""
+        if self.steps is None:
+            return False
+        batch = count if count is not None else self.INSTANT_BATCH
+        while True:
+            running = False
+            for lane in self.lanes:
+                if lane.steps is None:
+                    continue
+                if lane.advance(batch):
+                    running = True
+                else:
+                    self.finish_lane(lane)
+            if (count is not None or not running or
+                    time.perf_counter() > deadline):
+                break
+        self.steps_shown = max(lane.shown for lane in self.lanes)
+        if not running:
+            self.steps = None
+            self.set_paused(False)
+            self.on_finished()
+        return running
+
+    def finish_lane(self, lane):
+        """Rank a lane that just finished"""
+        self.finished.append(lane)
+        self.log(f"#{len(self.finished)} {lane.label} finished after {lane.shown} steps")
+
+    def render(self):
+        for lane in self.lanes:
+            lane.render()
+        # One blit covers the changes of every lane
+        boxes = [box for renderer in self.renderers for box in renderer.blit_boxes]
+        if boxes:
+            from matplotlib.transforms import Bbox
+            self.canvas.blit(Bbox.union(boxes))
+        for renderer in self.renderers:
+            renderer.blit_boxes.clear()
+
+    def update_visualization(self):
+        self.render()
+
+    def hide(self):
+        super().hide()
+        for renderer in self.renderers:
+            renderer.release()
+
+    def draw_time(self):
+        return sum(renderer.draw_seconds for renderer in self.renderers)
+
+    def on_finished(self):
+        # Redrawing the whole grid is slow, so the titles only show the
+        # ranking once every lane is done; a hidden tab draws them in show()
+        for place, lane in enumerate(self.finished, 1):
+            lane.renderer.set_title(f"#{place} {lane.label} ({lane.shown} steps)",
+                                    draw=False)
+        if self.visible:
+            self.canvas.draw()
+        self.log("Race finished")
+
+    def reset(self):
+        self.pending = None
+        super().reset()
@@ -0,0 +1,6 @@
+from visualization.array_visualizer import ArrayAlgorithmVisualizer
+
+class RadixSortVisualizer(ArrayAlgorithmVisualizer):
+    tab_title = "Radix Sort"
+    tab_order = 70
+    algorithm = 'radix'
@@ -0,0 +1,11 @@
+from visualization.array_visualizer import ArrayAlgorithmVisualizer
+
+class ShellSortVisualizer(ArrayAlgorithmVisualizer):
+    tab_title = "Shell Sort"
+    tab_order = 60
+    variants = {
+        'Ciura gaps': 'shell',
+        'Knuth gaps': 'shell_knuth',
+        'Sedgewick gaps': 'shell_sedgewick',
+        'Shell (n/2) gaps': 'shell_halving',
+    }
@@ -0,0 +1,761 @@
+"""Step-event generators for the visualized algorithms.
+
+Every generator works on the data it is given and yields ``(op, a, b)``
+tuples as it goes. A visualizer replays the events against its own copy of
+the data, so the algorithms never touch Tk or matplotlib.
+
+The sorts only index, slice, iterate and take the len() of their input, so
+any mutable sequence will do, such as engine.counting.CountingSequence to
+count every element access.
+"""
+from collections import deque
+
+# Array operations
+COMPARE = 0    # a, b: indices being compared
+SWAP = 1       # a, b: indices whose values were exchanged
+SHIFT = 2      # a, b: value at index a copied into index b
+WRITE = 3      # a, b: value b written to index a
+SELECT = 4     # a: index of the element picked as the key
+SORTED = 5     # a, b: indices a..b-1 are in their sorted position
+BLOCK_SHIFT = 13  # a, b: values at indices a..b-1 moved one place right
+
+# Tree operations
+VISIT = 6      # a: node printed by the traversal
+GO_LEFT = 7    # a, b: moving from node a down to its left child b
+GO_RIGHT = 8   # a, b: moving from node a down to its right child b
+NO_CHILD = 9   # a, b: node a has no child on side b (0 left, 1 right)
+THREAD = 10    # a, b: empty right pointer of node a pointed at its successor b
+UNTHREAD = 11  # a, b: that thread from node a to b removed again
+CLIMB = 12     # a, b: moving from node a along its thread back up to b
+
+OP_NAMES = {
+    COMPARE: 'compare', SWAP: 'swap', SHIFT: 'shift', WRITE: 'write',
+    SELECT: 'select', SORTED: 'sorted', VISIT: 'visit', GO_LEFT: 'go_left',
+    GO_RIGHT: 'go_right', NO_CHILD: 'no_child', THREAD: 'thread',
+    UNTHREAD: 'unthread', CLIMB: 'climb', BLOCK_SHIFT: 'block_shift',
+}
+
+# Marks a missing child in the tree arrays
+NO_NODE = -1
+
+
+def bubble_sort_steps(array):
+    """Bubble sort the array in place, yielding a step event per operation
+
+    Args:
+        array (list): Values to sort
+
+    Yields:
+        tuple: (op, a, b) step events
+    """
+    n = len(array)
+
+    # Outer loop for passes
+    for i in range(n):
+        swapped = False
+
+        # Inner loop for comparisons and swaps
+        for j in range(0, n - i - 1):
+            yield (COMPARE, j, j + 1)
+            if array[j] > array[j + 1]:
+                array[j], array[j + 1] = array[j + 1], array[j]
+                swapped = True
+                yield (SWAP, j, j + 1)
+
+        # If no swapping occurred in this pass, array is sorted
+        if not swapped:
+            break
+
+        # The largest remaining element has bubbled to the end
+        yield (SORTED, n - i - 1, n - i)
+
+    yield (SORTED, 0, n)
+
+
+def insertion_sort_steps(array):
+    """Insertion sort the array in place, yielding a step event per operation
+
+    Args:
+        array (list): Values to sort
+
+    Yields:
+        tuple: (op, a, b) step events
+    """
+    n = len(array)
+    if n == 0:
+        return
+
+    # First element is already sorted
+    yield (SORTED, 0, 1)
+
+    for i in range(1, n):
+        key = array[i]
+        yield (SELECT, i, 0)
+
+        # Move elements of arr[0..i-1] that are greater than key
+        # to one position ahead of their current position
+        j = i - 1
+        while j >= 0:
+            yield (COMPARE, j, j + 1)
+            if array[j] <= key:
+                break
+            array[j + 1] = array[j]
+            yield (SHIFT, j, j + 1)
+            j -= 1
+
+        # Place the key in its correct position
+        array[j + 1] = key
+        yield (WRITE, j + 1, key)
+        yield (SORTED, 0, i + 1)
+
+
+def _insertion_point(array, i):
+    """Binary search array[0:i] for where array[i] belongs
+
+    Returns the position after any equal values, so that the sort stays
+    stable. The key is still at index i while it is compared.
+    """
+    key = array[i]
+    lo, hi = 0, i
+    while lo < hi:
+        mid = (lo + hi) // 2
+        yield (COMPARE, mid, i)
+        if key < array[mid]:
+            hi = mid
+        else:
+            lo = mid + 1
+    return lo
+
+
+def binary_insertion_sort_steps(array):
+    """Insertion sort that finds each key's position by binary search
+
+    Takes O(n log n) comparisons instead of O(n^2); the larger elements
+    are still shifted one at a time.
+
+    Args:
+        array (list): Values to sort
+
+    Yields:
+        tuple: (op, a, b) step events
+    """
+    n = len(array)
+    if n == 0:
+        return
+    yield (SORTED, 0, 1)
+
+    for i in range(1, n):
+        key = array[i]
+        yield (SELECT, i, 0)
+        pos = yield from _insertion_point(array, i)
+        for j in range(i - 1, pos - 1, -1):
+            array[j + 1] = array[j]
+            yield (SHIFT, j, j + 1)
+        array[pos] = key
+        yield (WRITE, pos, key)
+        yield (SORTED, 0, i + 1)
+
+
+def block_insertion_sort_steps(array):
+    """Binary insertion sort that moves the larger elements as one block
+
+    The elements after the key's position are moved with a single slice
+    assignment, so every insertion takes two write operations however far
+    the key travels.
+
+    Args:
+        array (list): Values to sort
+
+    Yields:
+        tuple: (op, a, b) step events
+    """
+    n = len(array)
+    if n == 0:
+        return
+    yield (SORTED, 0, 1)
+
+    for i in range(1, n):
+        key = array[i]
+        yield (SELECT, i, 0)
+        pos = yield from _insertion_point(array, i)
+        if pos < i:
+            array[pos + 1:i + 1] = array[pos:i]
+            yield (BLOCK_SHIFT, pos, i)
+        array[pos] = key
+        yield (WRITE, pos, key)
+        yield (SORTED, 0, i + 1)
+
+
+def _merge(array, lo, mid, hi, buffer):
+    """Merge the sorted runs array[lo:mid] and array[mid:hi] in place
+
+    Only the left run is copied out, so every write lands on a slot whose
+    value has already been consumed. Comparisons report the positions the
+    two candidates held before the merge started.
+    """
+    buffer[:mid - lo] = array[lo:mid]
+    i, j, k = 0, mid, lo
+    left_len = mid - lo
+    while i < left_len and j < hi:
+        yield (COMPARE, lo + i, j)
+        if array[j] < buffer[i]:
+            array[k] = array[j]
+            j += 1
+        else:
+            array[k] = buffer[i]
+            i += 1
+        yield (WRITE, k, array[k])
+        k += 1
+
+    # Whatever is left of the right run is already in place
+    while i < left_len:
+        array[k] = buffer[i]
+        yield (WRITE, k, array[k])
+        i += 1
+        k += 1
+
+
+def merge_sort_steps(array):
+    """Top-down merge sort, yielding a step event per operation
+
+    Args:
+        array (list): Values to sort
+
+    Yields:
+        tuple: (op, a, b) step events
+    """
+    n = len(array)
+    buffer = [None] * (n // 2 + 1)
+
+    # List the merges of the recursion up front; replaying them backwards
+    # gives the recursive order without a generator per level
+    merges = []
+    stack = [(0, n)]
+    while stack:
+        lo, hi = stack.pop()
+        if hi - lo < 2:
+            continue
+        mid = (lo + hi) // 2
+        merges.append((lo, mid, hi))
+        stack.append((lo, mid))
+        stack.append((mid, hi))
+
+    for lo, mid, hi in reversed(merges):
+        yield from _merge(array, lo, mid, hi, buffer)
+    yield (SORTED, 0, n)
+
+
+def bottom_up_merge_sort_steps(array):
+    """Bottom-up merge sort: merges runs of width 1, 2, 4, ... in passes"""
+    n = len(array)
+    buffer = [None] * (n // 2 + 1)
+    width = 1
+    while width < n:
+        for lo in range(0, n - width, 2 * width):
+            yield from _merge(array, lo, lo + width, min(lo + 2 * width, n), buffer)
+        width *= 2
+    yield (SORTED, 0, n)
+
+
+def natural_merge_sort_steps(array):
+    """Simplified Timsort: merges the runs already present in the input
+
+    Ascending runs are kept and strictly descending ones reversed in place.
+    Runs shorter than a minimum length are extended with insertion sort,
+    then neighbouring runs are merged pairwise until one is left.
+    """
+    n = len(array)
+    buffer = [None] * (n // 2 + 1)
+
+    # Minimum run length, chosen so the number of runs is close to a power
+    # of two, as Timsort does
+    min_run, rest = n, 0
+    while min_run >= 64:
+        rest |= min_run & 1
+        min_run >>= 1
+    min_run += rest
+
+    runs = []
+    lo = 0
+    while lo < n:
+        hi = lo + 1
+        if hi < n:
+            yield (COMPARE, lo, hi)
+            if array[hi] < array[lo]:
+                # Strictly descending run; reversing it keeps the sort stable
+                while hi + 1 < n:
+                    yield (COMPARE, hi, hi + 1)
+                    if not array[hi + 1] < array[hi]:
+                        break
+                    hi += 1
+                i, j = lo, hi
+                while i < j:
+                    array[i], array[j] = array[j], array[i]
+                    yield (SWAP, i, j)
+                    i += 1
+                    j -= 1
+            else:
+                while hi + 1 < n:
+                    yield (COMPARE, hi, hi + 1)
+                    if array[hi + 1] < array[hi]:
+                        break
+                    hi += 1
+        hi += 1
+
+        # Extend short runs to min_run with insertion sort
+        end = min(lo + min_run, n)
+        for i in range(hi, end):
+            key = array[i]
+            yield (SELECT, i, 0)
+            j = i - 1
+            while j >= lo:
+                yield (COMPARE, j, j + 1)
+                if array[j] <= key:
+                    break
+                array[j + 1] = array[j]
+                yield (SHIFT, j, j + 1)
+                j -= 1
+            array[j + 1] = key
+            yield (WRITE, j + 1, key)
+        hi = max(hi, end)
+        runs.append(lo)
+        lo = hi
+
+    # Merge neighbouring runs until a single one is left
+    runs.append(n)
+    while len(runs) > 2:
+        merged = []
+        for k in range(0, len(runs) - 2, 2):
+            yield from _merge(array, runs[k], runs[k + 1], runs[k + 2], buffer)
+            merged.append(runs[k])
+        if len(runs) % 2 == 0:
+            merged.append(runs[-2])
+        merged.append(n)
+        runs = merged
+    yield (SORTED, 0, n)
+
+
+def quick_sort_steps(array):
+    """Quicksort with median-of-three pivots and Hoare-style partitioning
+
+    The smaller side of every partition is sorted first and the larger one
+    kept on an explicit stack, so the stack stays O(log n) deep whatever the
+    input.
+    """
+    stack = [(0, len(array) - 1)]
+    while stack:
+        lo, hi = stack.pop()
+        size = hi - lo + 1
+        if size <= 3:
+            # Up to three elements: sort them with compare-exchanges
+            pairs = {2: [(lo, hi)], 3: [(lo, lo + 1), (lo + 1, hi), (lo, lo + 1)]}
+            for i, j in pairs.get(size, []):
+                yield (COMPARE, i, j)
+                if array[j] < array[i]:
+                    array[i], array[j] = array[j], array[i]
+                    yield (SWAP, i, j)
+            if size > 0:
+                yield (SORTED, lo, hi + 1)
+            continue
+
+        # Order lo, mid and hi, then park the median next to hi
+        mid = (lo + hi) // 2
+        for i, j in ((lo, mid), (mid, hi), (lo, mid)):
+            yield (COMPARE, i, j)
+            if array[j] < array[i]:
+                array[i], array[j] = array[j], array[i]
+                yield (SWAP, i, j)
+        array[mid], array[hi - 1] = array[hi - 1], array[mid]
+        yield (SWAP, mid, hi - 1)
+        pivot = array[hi - 1]
+        yield (SELECT, hi - 1, 0)
+
+        # array[lo] <= pivot <= array[hi] act as sentinels
+        i, j = lo, hi - 1
+        while True:
+            i += 1
+            yield (COMPARE, i, hi - 1)
+            while array[i] < pivot:
+                i += 1
+                yield (COMPARE, i, hi - 1)
+            j -= 1
+            yield (COMPARE, j, hi - 1)
+            while pivot < array[j]:
+                j -= 1
+                yield (COMPARE, j, hi - 1)
+            if i >= j:
+                break
+            array[i], array[j] = array[j], array[i]
+            yield (SWAP, i, j)
+
+        # Put the pivot in its final place
+        array[i], array[hi - 1] = array[hi - 1], array[i]
+        yield (SWAP, i, hi - 1)
+        yield (SORTED, i, i + 1)
+
+        # Push the larger side first so the smaller is sorted next
+        sides = sorted([(lo, i - 1), (i + 1, hi)], key=lambda s: s[1] - s[0])
+        stack.extend(side for side in reversed(sides) if side[1] >= side[0])
+
+
+def quick_sort_3way_steps(array):
+    """Quicksort with Dijkstra's 3-way partitioning
+
+    Elements equal to the pivot are gathered in the middle and never looked
+    at again, so inputs with many duplicates sort in close to linear time.
+    """
+    stack = [(0, len(array) - 1)]
+    while stack:
+        lo, hi = stack.pop()
+        if hi <= lo:
+            if hi == lo:
+                yield (SORTED, lo, lo + 1)
+            continue
+
+        # Median of three as the pivot, moved to lo
+        mid = (lo + hi) // 2
+        for i, j in ((lo, mid), (mid, hi), (lo, mid)):
+            yield (COMPARE, i, j)
+            if array[j] < array[i]:
+                array[i], array[j] = array[j], array[i]
+                yield (SWAP, i, j)
+        array[lo], array[mid] = array[mid], array[lo]
+        yield (SWAP, lo, mid)
+        yield (SELECT, lo, 0)
+
+        # array[lo:lt] < pivot, array[lt:i] == pivot, array[gt+1:hi+1] > pivot;
+        # array[lt] always holds a copy of the pivot
+        lt, i, gt = lo, lo + 1, hi
+        while i <= gt:
+            yield (COMPARE, i, lt)
+            if array[i] < array[lt]:
+                array[lt], array[i] = array[i], array[lt]
+                yield (SWAP, lt, i)
+                lt += 1
+                i += 1
+            elif array[lt] < array[i]:
+                array[i], array[gt] = array[gt], array[i]
+                yield (SWAP, i, gt)
+                gt -= 1
+            else:
+                i += 1
+        yield (SORTED, lt, gt + 1)
+
+        sides = sorted([(lo, lt - 1), (gt + 1, hi)], key=lambda s: s[1] - s[0])
+        stack.extend(reversed(sides))
+
+
+def heap_sort_steps(array):
+    """Heapsort: builds a max-heap, then moves the root to the end n times"""
+    n = len(array)
+
+    def sift_down(root, end):
+        while True:
+            child = 2 * root + 1
+            if child >= end:
+                return
+            if child + 1 < end:
+                yield (COMPARE, child, child + 1)
+                if array[child] < array[child + 1]:
+                    child += 1
+            yield (COMPARE, root, child)
+            if not array[root] < array[child]:
+                return
+            array[root], array[child] = array[child], array[root]
+            yield (SWAP, root, child)
+            root = child
+
+    for root in range(n // 2 - 1, -1, -1):
+        yield from sift_down(root, n)
+
+    for end in range(n - 1, 0, -1):
+        array[0], array[end] = array[end], array[0]
+        yield (SWAP, 0, end)
+        yield (SORTED, end, end + 1)
+        yield from sift_down(0, end)
+    if n:
+        yield (SORTED, 0, 1)
+
+
+def shell_gaps(n, sequence='ciura'):
+    """Decreasing gap sequence for Shell sort on n elements
+
+    Args:
+        n (int): Number of elements
+        sequence (str): 'shell' (n/2, n/4, ...), 'knuth' (1, 4, 13, ...),
+            'sedgewick' (1, 8, 23, 77, ...) or 'ciura' (1, 4, 10, 23, 57, ...)
+
+    Returns:
+        list: Gaps, largest first, ending with 1
+    """
+    if sequence == 'shell':
+        gaps = []
+        gap = n // 2
+        while gap > 0:
+            gaps.append(gap)
+            gap //= 2
+        return gaps or [1]
+
+    if sequence == 'knuth':
+        gaps, gap = [], 1
+        while gap < max(n // 3, 1) or not gaps:
+            gaps.append(gap)
+            gap = 3 * gap + 1
+    elif sequence == 'sedgewick':
+        gaps, k = [1], 1
+        while True:
+            gap = 4 ** k + 3 * 2 ** (k - 1) + 1
+            if gap >= n:
+                break
+            gaps.append(gap)
+            k += 1
+    elif sequence == 'ciura':
+        # Measured best gaps, extended by a factor of 2.25 beyond 701
+        gaps = [1, 4, 10, 23, 57, 132, 301, 701]
+        while gaps[-1] * 2.25 < n:
+            gaps.append(int(gaps[-1] * 2.25))
+        gaps = [gap for gap in gaps if gap < n] or [1]
+    else:
+        raise ValueError(f"Unknown gap sequence {sequence!r}")
+    return gaps[::-1]
+
+
+def shell_sort_steps(array, sequence='ciura'):
+    """Shell sort: insertion sort over elements gap apart, for shrinking gaps
+
+    Args:
+        array (list): Values to sort
+        sequence (str): Gap sequence, see shell_gaps
+
+    Yields:
+        tuple: (op, a, b) step events
+    """
+    n = len(array)
+    for gap in shell_gaps(n, sequence):
+        for i in range(gap, n):
+            key = array[i]
+            yield (SELECT, i, 0)
+            j = i - gap
+            while j >= 0:
+                yield (COMPARE, j, j + gap)
+                if array[j] <= key:
+                    break
+                array[j + gap] = array[j]
+                yield (SHIFT, j, j + gap)
+                j -= gap
+            if j + gap != i:
+                array[j + gap] = key
+                yield (WRITE, j + gap, key)
+    yield (SORTED, 0, n)
+
+
+def radix_sort_steps(array, base=10):
+    """LSD radix sort: a stable counting pass per digit, least significant
+    first. No comparisons are made; each pass writes back every element
+    whose position changed.
+
+    Args:
+        array (list): Integers to sort
+        base (int): Radix of the digits
+
+    Yields:
+        tuple: (op, a, b) step events
+    """
+    n = len(array)
+    if n == 0:
+        return
+    # Sort by the distance from the smallest value so negatives work too
+    low = min(array)
+    largest = max(array) - low
+
+    place = 1
+    while place <= largest:
+        counts = [0] * (base + 1)
+        for value in array:
+            counts[(value - low) // place % base + 1] += 1
+        for digit in range(base):
+            counts[digit + 1] += counts[digit]
+
+        # Place every value after the ones with smaller digits
+        output = [None] * n
+        for value in array:
+            digit = (value - low) // place % base
+            output[counts[digit]] = value
+            counts[digit] += 1
+        for i, value in enumerate(output):
+            if array[i] != value:
+                array[i] = value
+                yield (WRITE, i, value)
+        place *= base
+    yield (SORTED, 0, n)
+
+
+# The traversals below keep their own stack instead of recursing, so they
+# work on degenerate trees of any depth and avoid a generator per node.
+
+def inorder_steps(tree, node):
+    """In-order traversal (left, root, right) of an array-backed binary tree
+
+    Args:
+        tree (BinaryTree): Tree to traverse
+        node (int): Index of the node to start from
+
+    Yields:
+        tuple: (op, a, b) step events, with node indices as operands
+    """
+    left, right = tree.left, tree.right
+    stack = []    # Nodes whose left subtree is being traversed
+
+    while True:
+        # Walk down the left spine
+        while left[node] != NO_NODE:
+            yield (GO_LEFT, node, left[node])
+            stack.append(node)
+            node = left[node]
+        yield (NO_CHILD, node, 0)
+
+        # Visit nodes on the way back up until one has a right subtree
+        while True:
+            yield (VISIT, node, 0)
+            if right[node] != NO_NODE:
+                yield (GO_RIGHT, node, right[node])
+                node = right[node]
+                break
+            yield (NO_CHILD, node, 1)
+            if not stack:
+                return
+            node = stack.pop()
+
+
+def preorder_steps(tree, node):
+    """Pre-order traversal (root, left, right) of an array-backed binary tree"""
+    left, right = tree.left, tree.right
+    stack = []    # Nodes whose right subtree is still to come
+
+    while True:
+        yield (VISIT, node, 0)
+        if left[node] != NO_NODE:
+            yield (GO_LEFT, node, left[node])
+            stack.append(node)
+            node = left[node]
+            continue
+        yield (NO_CHILD, node, 0)
+
+        # Back up to the nearest node with a right subtree
+        while right[node] == NO_NODE:
+            yield (NO_CHILD, node, 1)
+            if not stack:
+                return
+            node = stack.pop()
+        yield (GO_RIGHT, node, right[node])
+        node = right[node]
+
+
+def postorder_steps(tree, node):
+    """Post-order traversal (left, right, root) of an array-backed binary tree"""
+    left, right = tree.left, tree.right
+    # Nodes being returned to: node after its left subtree, ~node after
+    # its right subtree
+    stack = []
+    descend = True
+
+    while True:
+        if descend:
+            if left[node] != NO_NODE:
+                yield (GO_LEFT, node, left[node])
+                stack.append(node)
+                node = left[node]
+                continue
+            yield (NO_CHILD, node, 0)
+
+        if right[node] != NO_NODE:
+            yield (GO_RIGHT, node, right[node])
+            stack.append(~node)
+            node = right[node]
+            descend = True
+            continue
+        yield (NO_CHILD, node, 1)
+
+        # Visit finished nodes until one still has its right side to do
+        while True:
+            yield (VISIT, node, 0)
+            if not stack:
+                return
+            top = stack.pop()
+            if top >= 0:
+                node = top
+                break
+            node = ~top
+        descend = False
+
+
+def levelorder_steps(tree, node):
+    """Level-order (breadth-first) traversal of an array-backed binary tree
+
+    Children are queued as their parent is visited; GO_LEFT and GO_RIGHT
+    mark a child being queued.
+    """
+    left, right = tree.left, tree.right
+    queue = deque([node])
+
+    while queue:
+        node = queue.popleft()
+        yield (VISIT, node, 0)
+        if left[node] != NO_NODE:
+            yield (GO_LEFT, node, left[node])
+            queue.append(left[node])
+        else:
+            yield (NO_CHILD, node, 0)
+        if right[node] != NO_NODE:
+            yield (GO_RIGHT, node, right[node])
+            queue.append(right[node])
+        else:
+            yield (NO_CHILD, node, 1)
+
+
+def morris_inorder_steps(tree, node):
+    """Morris in-order traversal, using no stack at all
+
+    Before descending into a left subtree, the empty right pointer of the
+    node's in-order predecessor is threaded back to the node, so the
+    traversal can climb back up without remembering the path. Threads are
+    removed on the second arrival, leaving the tree unchanged once the
+    traversal has run to the end.
+    """
+    left, right = tree.left, tree.right
+
+    while node != NO_NODE:
+        if left[node] == NO_NODE:
+            yield (NO_CHILD, node, 0)
+            yield (VISIT, node, 0)
+            node = yield from _morris_right(tree, node)
+            continue
+
+        # Rightmost node of the left subtree is the in-order predecessor
+        pred = left[node]
+        while right[pred] != NO_NODE and right[pred] != node:
+            pred = right[pred]
+
+        if right[pred] == NO_NODE:
+            right[pred] = node
+            yield (THREAD, pred, node)
+            yield (GO_LEFT, node, left[node])
+            node = left[node]
+        else:
+            # Back from the left subtree: remove the thread and visit
+            right[pred] = NO_NODE
+            yield (UNTHREAD, pred, node)
+            yield (VISIT, node, 0)
+            node = yield from _morris_right(tree, node)
+
+
+def _morris_right(tree, node):
+    """Leave node to the right, by its right child or its thread"""
+    target = tree.right[node]
+    if target == NO_NODE:
+        yield (NO_CHILD, node, 1)
+    elif tree.parent[target] == node:
+        yield (GO_RIGHT, node, target)
+    else:
+        yield (CLIMB, node, target)
+    return target
@@ -0,0 +1,208 @@
+"""Benchmark the sorting algorithms without the GUI.
+
+Runs every sort on every input distribution over a range of sizes and
+reports wall time, operation counts and peak memory as JSON or CSV,
+optionally plotting them per distribution, at the largest size or as
+scaling curves.
+
+Example:
+    python benchmark.py --sizes 100 200 400 800 --format csv --plot scaling.png --plot-scaling
+"""
+import argparse
+import csv
+import json
+import sys
+import time
+import tracemalloc
+from collections import deque
+
+from algorithms.steps import COMPARE, SWAP, SHIFT, WRITE, BLOCK_SHIFT, OP_NAMES
+from engine.counting import CountingSequence
+from engine.trace import SORTS
+from utils.data_generator import DISTRIBUTIONS, generate
+
+FIELDS = ['algorithm', 'distribution', 'size', 'seed', 'seconds',
+          'comparisons', 'swaps', 'writes', 'element_reads', 'element_writes',
+          'peak_kib']
+
+
+def time_sort(algorithm, data, repeat=3):
+    """Best wall time of running a sort to completion
+
+    Args:
+        algorithm (str): Key in SORTS
+        data (list): Input array; left untouched
+        repeat (int): Number of timed runs
+
+    Returns:
+        float: Fastest run in seconds
+    """
+    best = float('inf')
+    expected = sorted(data)
+    for _ in range(repeat):
+        values = list(data)
+        started = time.perf_counter()
+        # Drain the step generator without keeping any events
+        deque(SORTS[algorithm](values), maxlen=0)
+        best = min(best, time.perf_counter() - started)
+        if values != expected:
+            raise RuntimeError(f"{algorithm} sort produced an unsorted array")
+    return best
+
+
+def count_sort(algorithm, data):
+    """Count the operations of one run and measure its peak memory
+
+    Comparisons, swaps and writes come from the step events; element reads
+    and writes are every access the sort made to the array, counted by
+    running it on a CountingSequence. time_sort runs on a plain list, so
+    the timings carry none of the counting overhead.
+
+    Args:
+        algorithm (str): Key in SORTS
+        data (list): Input array; left untouched
+
+    Returns:
+        dict: comparisons, swaps, writes, element_reads, element_writes and
+            peak_kib
+    """
+    values = CountingSequence(list(data))
+    counts = [0] * len(OP_NAMES)
+    tracemalloc.start()
+    for op, a, b in SORTS[algorithm](values):
+        counts[op] += 1
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return {
+        'comparisons': counts[COMPARE],
+        'swaps': counts[SWAP],
+        'writes': counts[SHIFT] + counts[WRITE] + counts[BLOCK_SHIFT],
+        'element_reads': values.reads,
+        'element_writes': values.writes,
+        'peak_kib': round(peak / 1024, 1),
+    }
+
+
+def run_benchmarks(algorithms, distributions, sizes, repeat=3, seed=0):
+    """Benchmark every algorithm on every distribution and size
+
+    All algorithms are given the same array for a distribution and size.
+
+    Yields:
+        dict: One result row per (algorithm, distribution, size)
+    """
+    for distribution in distributions:
+        for size in sizes:
+            data = generate(distribution, size, seed).tolist()
+            for algorithm in algorithms:
+                row = {
+                    'algorithm': algorithm,
+                    'distribution': distribution,
+                    'size': size,
+                    'seed': seed,
+                    'seconds': time_sort(algorithm, data, repeat),
+                }
+                row.update(count_sort(algorithm, data))
+                yield row
+
+
+def write_results(results, out, fmt):
+    """Write result rows as JSON or CSV"""
+    if fmt == 'json':
+        json.dump(results, out, indent=2)
+        out.write("\n")
+    else:
+        writer = csv.DictWriter(out, fieldnames=FIELDS)
+        writer.writeheader()
+        writer.writerows(results)
+
+
+def plot_results(results, path, scaling=False):
+    """Plot wall time and comparisons, one row of axes per distribution
+
+    By default every algorithm gets a bar for the largest size that was
+    run. With scaling, both are drawn against size instead, one curve per
+    algorithm on log-log axes, with a single legend beside the axes.
+
+    Args:
+        results (list): Result rows from run_benchmarks
+        path (str): Image file to save
+        scaling (bool): Plot every size as curves rather than the largest
+            one as bars
+    """
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+    distributions = list(dict.fromkeys(row['distribution'] for row in results))
+    algorithms = sorted({row['algorithm'] for row in results})
+    largest = max(row['size'] for row in results)
+
+    fig = Figure(figsize=(12, 1 + 2.5 * len(distributions)), layout='constrained')
+    FigureCanvasAgg(fig)
+    axes = fig.subplots(len(distributions), 2, squeeze=False, sharex='col',
+                        sharey='row' if not scaling else False)
+    fields = (('seconds', "Wall time (s)"), ('comparisons', "Comparisons"))
+
+    def plotted(row, field):
+        # Log axes cannot show a sort that made no comparisons
+        return max(row[field], 1) if field == 'comparisons' else row[field]
+
+    for (time_ax, cmp_ax), distribution in zip(axes, distributions):
+        rows = [row for row in results if row['distribution'] == distribution]
+        for ax, (field, label) in zip((time_ax, cmp_ax), fields):
+            if scaling:
+                for i, algorithm in enumerate(algorithms):
+                    curve = sorted((row['size'], plotted(row, field)) for row in rows
+                                   if row['algorithm'] == algorithm)
+                    ax.plot(*zip(*curve), marker='o', label=algorithm,
+                            color=f"C{i % 10}", linestyle='-' if i < 10 else '--')
+                ax.set_yscale('log')
+            else:
+                values = {row['algorithm']: plotted(row, field) for row in rows
+                          if row['size'] == largest}
+                ax.barh(algorithms, [values.get(algorithm, 0) for algorithm in algorithms])
+                ax.tick_params(axis='y', labelsize='small')
+            ax.set_xscale('log')
+            ax.grid(True, which='both', alpha=0.3)
+        time_ax.set_ylabel(distribution)
+
+    for ax, (field, label) in zip(axes[0], fields):
+        ax.set_title(label if scaling else f"{label}, {largest} values")
+    if scaling:
+        for ax in axes[-1]:
+            ax.set_xlabel("Array size")
+        fig.legend(*axes[0][0].get_legend_handles_labels(), loc='outside right upper',
+                   fontsize='small')
+    fig.savefig(path)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the sorting algorithms headlessly")
+    parser.add_argument('--algorithms', nargs='+', choices=sorted(SORTS), default=sorted(SORTS))
+    parser.add_argument('--distributions', nargs='+', choices=sorted(DISTRIBUTIONS),
+                        default=list(DISTRIBUTIONS))
+    parser.add_argument('--sizes', nargs='+', type=int, default=[100, 200, 400, 800])
+    parser.add_argument('--repeat', type=int, default=3, help="timed runs per case; the best is kept")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--format', choices=('json', 'csv'), default='json')
+    parser.add_argument('--output', help="file to write results to (default: stdout)")
+    parser.add_argument('--plot', help="save a chart of the results to this image file")
+    parser.add_argument('--plot-scaling', action='store_true',
+                        help="plot every size as curves instead of the largest as bars")
+    args = parser.parse_args(argv)
+
+    results = list(run_benchmarks(args.algorithms, args.distributions, args.sizes,
+                                  args.repeat, args.seed))
+
+    if args.output:
+        with open(args.output, 'w', newline='') as out:
+            write_results(results, out, args.format)
+    else:
+        write_results(results, sys.stdout, args.format)
+
+    if args.plot:
+        plot_results(results, args.plot, args.plot_scaling)
+
+
+if __name__ == "__main__":
+    main()
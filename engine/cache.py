@@ -0,0 +1,160 @@
+"""Memoized traces of algorithm runs, keyed by what was run on what.
+
+The same inputs tend to be run over and over: the example tree, a seeded
+array shown to a class, the race's data after a reset. A TraceCache keeps
+recent traces under a hash of the algorithm name and the run's input, so
+running a seen input again replays the stored trace instead of recording
+it anew. Memory use is bounded by the byte size of the kept traces, least
+recently used first out, and traces can also be kept in a directory, where
+they outlive the program and come back memory-mapped.
+"""
+import hashlib
+import json
+import os
+import shutil
+from array import array
+from collections import OrderedDict
+
+from engine.trace import Trace, record_sort, record_traversal
+
+# Default bound on the bytes of trace columns kept in memory
+MAX_BYTES = 256 * 2**20
+
+
+def trace_size(trace):
+    """Bytes held by a trace's event columns and input"""
+    return sum(len(column) * column.itemsize
+               for column in (trace.ops, trace.a, trace.b, trace.data))
+
+
+class TraceCache:
+    """Least recently used traces, bounded by their size in bytes
+
+    Args:
+        max_bytes (int): Bytes of traces to keep in memory
+        directory (str): Where to also save traces, or None to keep them
+            in memory only. Saved traces are never deleted by the cache.
+    """
+
+    def __init__(self, max_bytes=MAX_BYTES, directory=None):
+        self.max_bytes = max_bytes
+        self.directory = directory
+        self.traces = OrderedDict()
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.traces)
+
+    @staticmethod
+    def key(algorithm, data, meta=None):
+        """Hex digest identifying a run of algorithm on data
+
+        Args:
+            algorithm (str): Key in SORTS or TRAVERSALS
+            data: Input values, as stored in Trace.data
+            meta (dict): Anything else the run depends on, such as the root
+        """
+        digest = hashlib.sha256(algorithm.encode())
+        digest.update(b'\0')
+        digest.update(array('i', data).tobytes())
+        if meta:
+            digest.update(json.dumps(meta, sort_keys=True).encode())
+        return digest.hexdigest()
+
+    def get(self, key):
+        """Trace stored under key, from memory or disk, or None"""
+        trace = self.traces.get(key)
+        if trace is not None:
+            self.traces.move_to_end(key)
+        elif self.directory is not None:
+            trace = self._load(key)
+            if trace is not None:
+                self._remember(key, trace)
+        if trace is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return trace
+
+    def put(self, key, trace):
+        """Store a trace under key, saving it too if there is a directory"""
+        if self.directory is not None:
+            self._save(key, trace)
+        self._remember(key, trace)
+
+    def clear(self):
+        """Forget every trace kept in memory"""
+        self.traces.clear()
+        self.nbytes = 0
+
+    def sort(self, algorithm, data):
+        """Trace of a sort on data, recorded only if it is not cached
+
+        Takes the same arguments as engine.trace.record_sort.
+        """
+        key = self.key(algorithm, data)
+        trace = self.get(key)
+        if trace is None:
+            trace = record_sort(algorithm, data)
+            self.put(key, trace)
+        return trace
+
+    def traversal(self, algorithm, tree):
+        """Trace of a traversal of tree, recorded only if it is not cached
+
+        Takes the same arguments as engine.trace.record_traversal.
+        """
+        key = self.key(algorithm, tree.keys + tree.left + tree.right,
+                       {'root': tree.root})
+        trace = self.get(key)
+        if trace is None:
+            trace = record_traversal(algorithm, tree)
+            self.put(key, trace)
+        return trace
+
+    def _remember(self, key, trace):
+        """Keep a trace in memory, evicting the oldest ones to make room"""
+        if key in self.traces:
+            self.nbytes -= trace_size(self.traces.pop(key))
+        size = trace_size(trace)
+        if size > self.max_bytes:
+            return
+        self.traces[key] = trace
+        self.nbytes += size
+        while self.nbytes > self.max_bytes:
+            _, oldest = self.traces.popitem(last=False)
+            self.nbytes -= trace_size(oldest)
+
+    def _save(self, key, trace):
+        """Write a trace to the directory unless it is already there
+
+        The trace is written under a temporary name and then renamed, so
+        another program sharing the directory never loads half a trace.
+        """
+        path = os.path.join(self.directory, key)
+        if os.path.isdir(path):
+            return
+        partial = f"{path}.{os.getpid()}.tmp"
+        try:
+            trace.save(partial)
+            os.rename(partial, path)
+        except OSError:
+            # Saved by someone else meanwhile, or the disk is unusable;
+            # the trace is still kept in memory
+            shutil.rmtree(partial, ignore_errors=True)
+
+    def _load(self, key):
+        """Memory-mapped trace saved under key, or None"""
+        path = os.path.join(self.directory, key)
+        if not os.path.isdir(path):
+            return None
+        try:
+            return Trace.load(path)
+        except (OSError, ValueError, KeyError):
+            return None
+
+
+# Cache shared by every tab of the visualizer
+TRACES = TraceCache()
@@ -0,0 +1,85 @@
+"""Element-level operation counts of a sort, measured on the data itself.
+
+Step events describe a run in the terms the visualizer draws: comparisons,
+swaps, shifts and writes. They do not show how often the sort touches the
+array, which is what its cost follows. A CountingSequence wraps the list a
+step generator sorts and counts every element read and written through it.
+
+The generators in algorithms.steps only index, slice, iterate and take the
+len() of their input, so they run unchanged on a plain list or on the
+wrapper. Counting is switched on by passing the wrapper and costs nothing
+otherwise: there is no flag to test on the uncounted path.
+"""
+from algorithms.steps import COMPARE, SWAP, SHIFT, WRITE, BLOCK_SHIFT, OP_NAMES
+from engine.trace import SORTS
+
+
+class CountingSequence:
+    """Mutable sequence that counts element reads and writes
+
+    Slices and iteration count one access per element they cover.
+
+    Args:
+        values (list): Values to wrap; changed in place
+
+    Attributes:
+        values (list): The wrapped list
+        reads (int): Elements read so far
+        writes (int): Elements written so far
+    """
+
+    __slots__ = ('values', 'reads', 'writes')
+
+    def __init__(self, values):
+        self.values = values
+        self.reads = 0
+        self.writes = 0
+
+    def __len__(self):
+        return len(self.values)
+
+    def __getitem__(self, index):
+        if type(index) is int:
+            self.reads += 1
+            return self.values[index]
+        items = self.values[index]
+        self.reads += len(items)
+        return items
+
+    def __setitem__(self, index, value):
+        if type(index) is int:
+            self.writes += 1
+        else:
+            value = list(value)
+            self.writes += len(value)
+        self.values[index] = value
+
+    def __iter__(self):
+        # Callers such as min() and max() read every element
+        self.reads += len(self.values)
+        return iter(self.values)
+
+
+def count_operations(algorithm, data):
+    """Run a sort on a counting copy of data and tally what it did
+
+    Args:
+        algorithm (str): Key in SORTS
+        data (list): Values to sort; left untouched
+
+    Returns:
+        dict: comparisons, swaps and writes as reported by the step
+            events, where a block shift is one write, and the
+            element_reads and element_writes seen by the sequence
+    """
+    values = CountingSequence(list(data))
+    counts = [0] * len(OP_NAMES)
+    for op, a, b in SORTS[algorithm](values):
+        counts[op] += 1
+    return {
+        'comparisons': counts[COMPARE],
+        'swaps': counts[SWAP],
+        'writes': counts[SHIFT] + counts[WRITE] + counts[BLOCK_SHIFT],
+        'element_reads': values.reads,
+        'element_writes': values.writes,
+    }
@@ -0,0 +1,237 @@
+"""Headless checking of submitted sort and traversal answers.
+
+A test case is a JSON object naming an input and the answer to check:
+
+    {"id": "s1", "kind": "sort", "algorithm": "quick",
+     "input": [5, 2, 9, 1], "answer": [1, 2, 5, 9]}
+    {"id": "t1", "kind": "traversal", "algorithm": "preorder",
+     "tree": {"root": 2, "children": {"2": [1, 3], "1": [-1, -1], "3": [-1, -1]}},
+     "answer": [2, 1, 3]}
+
+Trees use either layout accepted by engine.tree.tree_from_json. Reference
+results come from the same step generators the tabs replay, so an answer is
+graded against exactly what the visualizer shows.
+
+Cases are read as raw JSON lines and handed to worker processes in chunks;
+each worker parses and grades a whole chunk, and results are yielded as the
+chunks finish, so memory stays bounded however many cases there are.
+"""
+import json
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, as_completed, wait, FIRST_COMPLETED
+
+from algorithms.steps import VISIT
+from engine.trace import SORTS, TRAVERSALS
+from engine.tree import tree_from_json
+
+# Cases graded by a worker per round trip
+CHUNK_SIZE = 2000
+
+# Reference results kept per worker; a class usually answers the same
+# few inputs, so most cases reuse one
+CACHE_SIZE = 4096
+
+# Sort used for cases that do not name one
+DEFAULT_SORT = 'quick'
+
+# Result statuses
+PASSED = 'pass'
+FAILED = 'fail'
+ERROR = 'error'
+
+
+def reference_sort(algorithm, data):
+    """Array left by running a sort's step generator to the end"""
+    values = list(data)
+    deque(SORTS[algorithm](values), maxlen=0)
+    return values
+
+
+def reference_traversal(algorithm, tree):
+    """Keys in the order a traversal visits them
+
+    The tree was checked for cycles and stray links when it was built, so
+    every traversal ends.
+    """
+    order = []
+    if not len(tree):
+        return order
+    keys = tree.keys
+    for op, a, b in TRAVERSALS[algorithm](tree, tree.root):
+        if op == VISIT:
+            order.append(keys[a])
+    return order
+
+
+# Reference results by (kind, algorithm, input key), per worker process
+_references = {}
+
+
+def cached_reference(key, compute):
+    """Result of compute(), remembered under key until the cache fills up"""
+    result = _references.get(key)
+    if result is None:
+        if len(_references) >= CACHE_SIZE:
+            _references.clear()
+        result = _references[key] = compute()
+    return result
+
+
+def compare(expected, answer):
+    """Describe the first difference between two sequences, or None"""
+    for i, (want, got) in enumerate(zip(expected, answer)):
+        if want != got:
+            return f"first difference at position {i}: expected {want}, got {got}"
+    if len(expected) != len(answer):
+        return f"expected {len(expected)} values, got {len(answer)}"
+    return None
+
+
+def grade_case(case):
+    """Grade one parsed test case
+
+    Args:
+        case (dict): Test case as described in the module docstring
+
+    Returns:
+        dict: id, kind, algorithm, status (PASSED, FAILED or ERROR) and,
+            unless the case passed, a message
+    """
+    kind = case.get('kind', 'sort')
+    result = {'id': case.get('id'), 'kind': kind}
+    try:
+        if kind == 'sort':
+            algorithm = case.get('algorithm', DEFAULT_SORT)
+            if algorithm not in SORTS:
+                raise ValueError(f"unknown sort {algorithm!r}")
+            data = tuple(case['input'])
+            expected = cached_reference(('sort', algorithm, data),
+                                        lambda: reference_sort(algorithm, data))
+        elif kind == 'traversal':
+            algorithm = case['algorithm']
+            if algorithm not in TRAVERSALS:
+                raise ValueError(f"unknown traversal {algorithm!r}")
+            # The tree's JSON text is a cheap key; the same tree written
+            # differently only misses the cache
+            tree = case['tree']
+            expected = cached_reference(('traversal', algorithm, json.dumps(tree)),
+                                        lambda: reference_traversal(algorithm,
+                                                                    tree_from_json(tree)))
+        else:
+            raise ValueError(f"unknown kind {kind!r}")
+        result['algorithm'] = algorithm
+        message = compare(expected, case['answer'])
+    except KeyError as e:
+        result.update(status=ERROR, message=f"missing key {e}")
+        return result
+    except (ValueError, TypeError, IndexError, OverflowError) as e:
+        result.update(status=ERROR, message=str(e))
+        return result
+
+    if message is None:
+        result['status'] = PASSED
+    else:
+        result.update(status=FAILED, message=message)
+    return result
+
+
+def grade_chunk(chunk):
+    """Parse and grade a chunk of (source, JSON text) pairs
+
+    Runs in a worker process. A case without an id is named after where it
+    was read from.
+
+    Returns:
+        list: One result dict per case, in chunk order
+    """
+    results = []
+    for source, text in chunk:
+        try:
+            case = json.loads(text)
+            if not isinstance(case, dict):
+                raise ValueError("a test case must be a JSON object")
+        except ValueError as e:
+            results.append({'id': source, 'status': ERROR, 'message': f"invalid JSON: {e}"})
+            continue
+        result = grade_case(case)
+        if result['id'] is None:
+            result['id'] = source
+        results.append(result)
+    return results
+
+
+def read_cases(path):
+    """Yield (source, JSON text) for every test case under path
+
+    path is a JSONL file with one case per line, or a directory whose
+    .jsonl files are read the same way and whose .json files each hold one
+    case or a list of cases. Blank lines are skipped.
+    """
+    if os.path.isdir(path):
+        for name in sorted(os.listdir(path)):
+            if name.endswith(('.json', '.jsonl')):
+                yield from read_cases(os.path.join(path, name))
+        return
+
+    if path.endswith('.json'):
+        with open(path) as f:
+            data = json.load(f)
+        cases = data if isinstance(data, list) else [data]
+        for i, case in enumerate(cases):
+            yield f"{path}:{i}", json.dumps(case)
+        return
+
+    with open(path) as f:
+        for number, line in enumerate(f, 1):
+            if line.strip():
+                yield f"{path}:{number}", line
+
+
+def chunks(items, size):
+    """Split an iterable into lists of at most size items"""
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def grade(cases, workers=None, chunk_size=CHUNK_SIZE):
+    """Grade test cases in a pool of worker processes
+
+    Only a few chunks per worker are in flight at a time, so cases are read
+    lazily and results come out while later cases are still being read.
+    Results are yielded in the order their chunks finish.
+
+    Args:
+        cases: Iterable of (source, JSON text) pairs, as from read_cases
+        workers (int): Worker processes; None for one per CPU, 0 to grade
+            in this process
+        chunk_size (int): Cases sent to a worker at once
+
+    Yields:
+        dict: Result of every case, as returned by grade_case
+    """
+    work = chunks(cases, chunk_size)
+    if workers == 0:
+        for chunk in work:
+            yield from grade_chunk(chunk)
+        return
+
+    workers = workers or os.cpu_count() or 1
+    window = 2 * workers
+    with ProcessPoolExecutor(workers) as pool:
+        pending = set()
+        for chunk in work:
+            pending.add(pool.submit(grade_chunk, chunk))
+            if len(pending) < window:
+                continue
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield from future.result()
+        for future in as_completed(pending):
+            yield from future.result()
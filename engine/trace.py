@@ -0,0 +1,225 @@
+"""Headless recording of algorithm runs.
+
+A Trace stores every step event of a run in three typed arrays (op codes,
+first operand, second operand) next to the run's input, so no Python object
+is kept per event. Traces can be saved to disk and loaded back as
+memory-mapped NumPy arrays.
+"""
+import json
+import os
+from array import array
+
+from functools import partial
+
+from algorithms.steps import (bubble_sort_steps, insertion_sort_steps,
+                              binary_insertion_sort_steps, block_insertion_sort_steps,
+                              merge_sort_steps, bottom_up_merge_sort_steps,
+                              natural_merge_sort_steps, quick_sort_steps,
+                              quick_sort_3way_steps, heap_sort_steps,
+                              shell_sort_steps, radix_sort_steps,
+                              inorder_steps, preorder_steps, postorder_steps,
+                              levelorder_steps, morris_inorder_steps,
+                              SWAP, SHIFT, WRITE, BLOCK_SHIFT, OP_NAMES, NO_NODE)
+
+SORTS = {
+    'bubble': bubble_sort_steps,
+    'insertion': insertion_sort_steps,
+    'insertion_binary': binary_insertion_sort_steps,
+    'insertion_block': block_insertion_sort_steps,
+    'merge': merge_sort_steps,
+    'merge_bottom_up': bottom_up_merge_sort_steps,
+    'natural_merge': natural_merge_sort_steps,
+    'quick': quick_sort_steps,
+    'quick_3way': quick_sort_3way_steps,
+    'heap': heap_sort_steps,
+    'shell': shell_sort_steps,
+    'shell_knuth': partial(shell_sort_steps, sequence='knuth'),
+    'shell_sedgewick': partial(shell_sort_steps, sequence='sedgewick'),
+    'shell_halving': partial(shell_sort_steps, sequence='shell'),
+    'radix': radix_sort_steps,
+}
+
+# Sorts that take about n^2 / 2 steps, or as many element moves; the tabs
+# refuse to record them on long arrays
+QUADRATIC_SORTS = {'bubble', 'insertion', 'insertion_binary', 'insertion_block'}
+
+TRAVERSALS = {
+    'inorder': inorder_steps,
+    'preorder': preorder_steps,
+    'postorder': postorder_steps,
+    'levelorder': levelorder_steps,
+    'morris': morris_inorder_steps,
+}
+
+# On-disk layout of a single event
+EVENT_DTYPE = [('op', 'u1'), ('a', '<i4'), ('b', '<i4')]
+
+# Events are converted to Python ints this many at a time when iterating
+CHUNK = 65536
+
+
+class Trace:
+    """Every step event of one algorithm run, stored column-wise
+
+    Attributes:
+        algorithm (str): Name of the algorithm that produced the trace
+        data: Input of the run. For sorts this is the unsorted array; for
+            traversals it is the tree's key, left and right arrays joined.
+        meta (dict): Extra JSON-serializable details, such as the root node
+        ops, a, b: Event columns, either array.array or NumPy arrays
+    """
+
+    def __init__(self, algorithm, data, meta=None):
+        self.algorithm = algorithm
+        self.data = array('i', data)
+        self.meta = meta or {}
+        self.ops = array('B')
+        self.a = array('i')
+        self.b = array('i')
+
+    def __len__(self):
+        return len(self.ops)
+
+    def __getitem__(self, index):
+        return (int(self.ops[index]), int(self.a[index]), int(self.b[index]))
+
+    def __iter__(self):
+        return self.events()
+
+    def events(self, start=0, stop=None):
+        """Iterate over (op, a, b) events in the range [start, stop)"""
+        stop = len(self) if stop is None else min(stop, len(self))
+        for lo in range(start, stop, CHUNK):
+            hi = min(lo + CHUNK, stop)
+            yield from zip(self.ops[lo:hi].tolist(), self.a[lo:hi].tolist(),
+                           self.b[lo:hi].tolist())
+
+    def counts(self):
+        """Number of events of each kind, keyed by operation name"""
+        if isinstance(self.ops, array):
+            return {name: self.ops.count(op) for op, name in OP_NAMES.items()}
+
+        import numpy as np
+        totals = np.bincount(self.ops, minlength=len(OP_NAMES))
+        return {name: int(totals[op]) for op, name in OP_NAMES.items()}
+
+    def result(self, stop=None):
+        """Replay the array events onto a copy of the input
+
+        Args:
+            stop (int): Number of events to replay. If None, replays all.
+
+        Returns:
+            list: The array as it was after those events
+        """
+        values = self.data.tolist()
+        for op, a, b in self.events(0, stop):
+            apply_event(values, op, a, b)
+        return values
+
+    def to_numpy(self):
+        """Return the events as a NumPy structured array"""
+        import numpy as np
+
+        events = np.empty(len(self), dtype=EVENT_DTYPE)
+        events['op'] = np.asarray(self.ops)
+        events['a'] = np.asarray(self.a)
+        events['b'] = np.asarray(self.b)
+        return events
+
+    def save(self, path):
+        """Write the trace to a directory of .npy files plus a JSON header"""
+        import numpy as np
+
+        os.makedirs(path, exist_ok=True)
+        np.save(os.path.join(path, 'events.npy'), self.to_numpy())
+        np.save(os.path.join(path, 'data.npy'),
+                np.asarray(self.data, dtype='<i4'))
+        with open(os.path.join(path, 'meta.json'), 'w') as f:
+            json.dump({'algorithm': self.algorithm, 'meta': self.meta}, f)
+
+    @classmethod
+    def load(cls, path, mmap=True):
+        """Load a trace written by save
+
+        Args:
+            path (str): Directory passed to save
+            mmap (bool): Memory-map the event columns instead of reading them
+
+        Returns:
+            Trace: Trace whose columns are NumPy arrays
+        """
+        import numpy as np
+
+        with open(os.path.join(path, 'meta.json')) as f:
+            header = json.load(f)
+        trace = cls(header['algorithm'], (), header['meta'])
+        trace.data = np.load(os.path.join(path, 'data.npy'))
+        events = np.load(os.path.join(path, 'events.npy'),
+                         mmap_mode='r' if mmap else None)
+        trace.ops, trace.a, trace.b = events['op'], events['a'], events['b']
+        return trace
+
+
+def apply_event(values, op, a, b):
+    """Apply the data change described by an array event, if any"""
+    if op == SWAP:
+        values[a], values[b] = values[b], values[a]
+    elif op == SHIFT:
+        values[b] = values[a]
+    elif op == WRITE:
+        values[a] = b
+    elif op == BLOCK_SHIFT:
+        values[a + 1:b + 1] = values[a:b]
+
+
+def record(steps, trace):
+    """Drain a step generator into a trace
+
+    Args:
+        steps: Iterator of (op, a, b) events
+        trace (Trace): Trace to append to
+
+    Returns:
+        Trace: The same trace
+    """
+    ops_append = trace.ops.append
+    a_append = trace.a.append
+    b_append = trace.b.append
+    for op, a, b in steps:
+        ops_append(op)
+        a_append(a)
+        b_append(b)
+    return trace
+
+
+def record_sort(algorithm, data):
+    """Run a sort headlessly and record its events
+
+    Args:
+        algorithm (str): Key in SORTS
+        data (list): Values to sort; left untouched
+
+    Returns:
+        Trace: Recorded run
+    """
+    trace = Trace(algorithm, data)
+    return record(SORTS[algorithm](list(data)), trace)
+
+
+def record_traversal(algorithm, tree):
+    """Run a tree traversal headlessly and record its events
+
+    Args:
+        algorithm (str): Key in TRAVERSALS
+        tree (BinaryTree): Tree to traverse from its root
+
+    Returns:
+        Trace: Recorded run; its data holds the keys, left and right arrays
+    """
+    # Copied before the run, as Morris threads the tree while it works
+    data = tree.keys + tree.left + tree.right
+    trace = Trace(algorithm, data, {'root': tree.root, 'nodes': len(tree)})
+    if tree.root == NO_NODE:
+        return trace
+    return record(TRAVERSALS[algorithm](tree, tree.root), trace)
@@ -0,0 +1,350 @@
+"""Array-backed binary trees: generation, loading and automatic layout.
+
+Nodes are numbered 0..n-1 and stored in parallel arrays, so trees with
+thousands of nodes cost a few integers per node. A node's key (the value it
+shows) is kept separately from its index.
+"""
+import json
+import random
+from array import array
+
+from algorithms.steps import NO_NODE
+
+
+class BinaryTree:
+    """Binary tree stored as parallel key/left/right/parent arrays
+
+    Attributes:
+        keys (array): Key shown for each node
+        left, right (array): Index of each node's children, NO_NODE for none
+        parent (array): Index of each node's parent, NO_NODE for the root
+        root (int): Index of the root node
+
+    The links are checked once here, so that no traversal can run into a
+    cycle or off the arrays: every child index must be a node or NO_NODE,
+    and no node may have two parents or be a child of anything if it is
+    the root, so no node is reached twice. Every node must also be reached
+    from the root, which rules out stray nodes and detached cycles.
+
+    Raises:
+        ValueError: If a key or index is not a 32-bit integer, the arrays
+            differ in length, or the links do not form a tree
+    """
+
+    def __init__(self, keys, left, right, root=0):
+        try:
+            self.keys = array('i', keys)
+            self.left = array('i', left)
+            self.right = array('i', right)
+        except (OverflowError, TypeError) as e:
+            raise ValueError(f"keys and child indices must be 32-bit integers ({e})") from None
+        n = len(self.keys)
+        if len(self.left) != n or len(self.right) != n:
+            raise ValueError(f"{n} keys but {len(self.left)} left and "
+                             f"{len(self.right)} right children")
+        if n and (type(root) is not int or not 0 <= root < n):
+            raise ValueError(f"root {root!r} is not a node")
+        self.root = root if n else NO_NODE
+
+        self.parent = array('i', [NO_NODE]) * n
+        for node in range(n):
+            for child in (self.left[node], self.right[node]):
+                if child == NO_NODE:
+                    continue
+                if not 0 <= child < n:
+                    raise ValueError(f"node {node} has child {child}, which is not a node")
+                if child == self.root:
+                    raise ValueError(f"node {node} links back to the root")
+                if self.parent[child] != NO_NODE:
+                    raise ValueError(f"node {child} has more than one parent")
+                self.parent[child] = node
+        reached = len(self.preorder_nodes())
+        if reached != n:
+            raise ValueError(f"{n - reached} nodes cannot be reached from the root")
+
+    def __len__(self):
+        return len(self.keys)
+
+    @classmethod
+    def from_dict(cls, tree, root):
+        """Build a tree from a dict mapping each key to [left_key, right_key]
+
+        Args:
+            tree (dict): Children of every node by key, -1 for no child
+            root (int): Key of the root node
+
+        Returns:
+            BinaryTree: Equivalent array-backed tree
+
+        Raises:
+            ValueError: If the root or a child is not a key of the tree
+        """
+        keys = list(tree)
+        index = {key: i for i, key in enumerate(keys)}
+        if root not in index:
+            raise ValueError(f"root {root!r} is not a key of the tree")
+
+        def node_of(key, side):
+            child = tree[key][side]
+            if child == -1:
+                return NO_NODE
+            if child not in index:
+                raise ValueError(f"child {child!r} of {key!r} is not a key")
+            return index[child]
+
+        left = [node_of(key, 0) for key in keys]
+        right = [node_of(key, 1) for key in keys]
+        return cls(keys, left, right, index[root])
+
+    def to_dict(self):
+        """Return the tree as a dict of key -> [left_key, right_key]"""
+        def key_of(node):
+            return self.keys[node] if node != NO_NODE else -1
+        return {self.keys[node]: [key_of(self.left[node]), key_of(self.right[node])]
+                for node in range(len(self))}
+
+    def depths(self):
+        """Depth of every node, computed top-down without recursion"""
+        depth = array('i', [0]) * len(self)
+        for node in self.preorder_nodes():
+            parent = self.parent[node]
+            if parent != NO_NODE:
+                depth[node] = depth[parent] + 1
+        return depth
+
+    def preorder_nodes(self):
+        """List node indices so that every parent comes before its children"""
+        order = []
+        stack = [self.root] if self.root != NO_NODE else []
+        while stack:
+            node = stack.pop()
+            order.append(node)
+            if self.right[node] != NO_NODE:
+                stack.append(self.right[node])
+            if self.left[node] != NO_NODE:
+                stack.append(self.left[node])
+        return order
+
+    def layout(self):
+        """Compute node positions with the Reingold-Tilford algorithm
+
+        Returns:
+            tuple: (xs, ys, spacing) where xs and ys list each node's
+                position in [0, 1] and spacing is the smallest gap between
+                neighbouring nodes, for sizing them
+        """
+        n = len(self)
+        if n == 0:
+            return [], [], 1.0
+        rel_x = tidy_offsets(self)
+        depth = self.depths()
+
+        # Absolute x is the sum of the offsets from the root down
+        x = [0.0] * n
+        for node in self.preorder_nodes():
+            parent = self.parent[node]
+            if parent != NO_NODE:
+                x[node] = x[parent] + rel_x[node]
+
+        # Fit into the unit square, leaving a margin for the node circles
+        lo, hi = min(x), max(x)
+        span = hi - lo or 1.0
+        height = max(depth) or 1
+        xs = [0.05 + 0.9 * (value - lo) / span if hi > lo else 0.5 for value in x]
+        ys = [0.9 - 0.8 * d / height for d in depth]
+        spacing = min(0.9 / span if hi > lo else 1.0, 0.8 / height)
+        return xs, ys, spacing
+
+    def save(self, path):
+        """Write the tree as JSON with one key/left/right list each"""
+        with open(path, 'w') as f:
+            json.dump({'root': self.root, 'keys': self.keys.tolist(),
+                       'left': self.left.tolist(), 'right': self.right.tolist()}, f)
+
+
+def tidy_offsets(tree, min_sep=1.0):
+    """Horizontal offset of every node from its parent (Reingold-Tilford)
+
+    Subtrees are placed bottom-up. The two subtrees of a node are pushed
+    apart just far enough that, at every depth they share, the right
+    contour of the left subtree stays min_sep away from the left contour of
+    the right subtree. Contours are followed through "threads" that link
+    the bottom of a shallower subtree to the next contour node of its
+    deeper sibling, so each merge only costs the height of the shallower
+    subtree and the whole layout is linear in the number of nodes.
+
+    Args:
+        tree (BinaryTree): Tree to lay out
+        min_sep (float): Minimum horizontal distance between nodes
+
+    Returns:
+        list: Offset of each node relative to its parent
+    """
+    n = len(tree)
+    left, right = tree.left, tree.right
+    offset = [0.0] * n
+    thread = [NO_NODE] * n         # Next contour node below a leaf
+    thread_offset = [0.0] * n      # x of the thread target relative to the leaf
+
+    # Deepest leftmost/rightmost node of each subtree, its x relative to the
+    # subtree root, and the subtree height
+    low_left = list(range(n))
+    low_left_x = [0.0] * n
+    low_right = list(range(n))
+    low_right_x = [0.0] * n
+    height = [0] * n
+
+    def next_left(node):
+        """Next node down the left contour and its x relative to node"""
+        if left[node] != NO_NODE:
+            return left[node], offset[left[node]]
+        if right[node] != NO_NODE:
+            return right[node], offset[right[node]]
+        return thread[node], thread_offset[node]
+
+    def next_right(node):
+        """Next node down the right contour and its x relative to node"""
+        if right[node] != NO_NODE:
+            return right[node], offset[right[node]]
+        if left[node] != NO_NODE:
+            return left[node], offset[left[node]]
+        return thread[node], thread_offset[node]
+
+    # Children are always handled before their parents
+    for node in reversed(tree.preorder_nodes()):
+        l, r = left[node], right[node]
+        if l == NO_NODE and r == NO_NODE:
+            continue
+
+        if l == NO_NODE or r == NO_NODE:
+            # A single child sits half a step to its side
+            child = l if l != NO_NODE else r
+            offset[child] = -min_sep / 2 if child == l else min_sep / 2
+            low_left[node] = low_left[child]
+            low_left_x[node] = low_left_x[child] + offset[child]
+            low_right[node] = low_right[child]
+            low_right_x[node] = low_right_x[child] + offset[child]
+            height[node] = height[child] + 1
+            continue
+
+        # Walk the facing contours level by level to find the separation
+        inner_l, x_l = l, 0.0      # x relative to the left subtree root
+        inner_r, x_r = r, 0.0      # x relative to the right subtree root
+        sep = min_sep
+        while True:
+            sep = max(sep, x_l - x_r + min_sep)
+            below_l, dx_l = next_right(inner_l)
+            below_r, dx_r = next_left(inner_r)
+            if below_l == NO_NODE or below_r == NO_NODE:
+                break
+            inner_l, x_l = below_l, x_l + dx_l
+            inner_r, x_r = below_r, x_r + dx_r
+
+        offset[l] = -sep / 2
+        offset[r] = sep / 2
+
+        # Thread the shallower subtree's outer contour onto the deeper one
+        if below_l != NO_NODE:
+            leaf = low_right[r]
+            thread[leaf] = below_l
+            thread_offset[leaf] = (offset[l] + x_l + dx_l) - (offset[r] + low_right_x[r])
+        elif below_r != NO_NODE:
+            leaf = low_left[l]
+            thread[leaf] = below_r
+            thread_offset[leaf] = (offset[r] + x_r + dx_r) - (offset[l] + low_left_x[l])
+
+        # The deeper subtree provides the bottom extremes
+        deep_left = l if height[l] >= height[r] else r
+        deep_right = r if height[r] >= height[l] else l
+        low_left[node] = low_left[deep_left]
+        low_left_x[node] = low_left_x[deep_left] + offset[deep_left]
+        low_right[node] = low_right[deep_right]
+        low_right_x[node] = low_right_x[deep_right] + offset[deep_right]
+        height[node] = max(height[l], height[r]) + 1
+
+    return offset
+
+
+def random_bst(n, seed=None):
+    """Binary search tree built by inserting keys 1..n in random order"""
+    keys = list(range(1, n + 1))
+    random.Random(seed).shuffle(keys)
+    left = [NO_NODE] * n
+    right = [NO_NODE] * n
+    for node in range(1, n):
+        key, current = keys[node], 0
+        while True:
+            side = left if key < keys[current] else right
+            if side[current] == NO_NODE:
+                side[current] = node
+                break
+            current = side[current]
+    return BinaryTree(keys, left, right)
+
+
+def complete_tree(n):
+    """Complete binary tree whose keys are in binary-search order"""
+    left = [2 * i + 1 if 2 * i + 1 < n else NO_NODE for i in range(n)]
+    right = [2 * i + 2 if 2 * i + 2 < n else NO_NODE for i in range(n)]
+    tree = BinaryTree([0] * n, left, right)
+
+    # Number the nodes in in-order so the tree is also a valid BST
+    key, stack, node = 1, [], tree.root
+    while stack or node != NO_NODE:
+        while node != NO_NODE:
+            stack.append(node)
+            node = tree.left[node]
+        node = stack.pop()
+        tree.keys[node] = key
+        key += 1
+        node = tree.right[node]
+    return tree
+
+
+def degenerate_tree(n, shape='right'):
+    """Skewed tree that is a single path of n nodes
+
+    Args:
+        n (int): Number of nodes
+        shape (str): 'right', 'left' or 'zigzag'
+
+    Returns:
+        BinaryTree: Degenerate tree
+    """
+    left = [NO_NODE] * n
+    right = [NO_NODE] * n
+    for node in range(n - 1):
+        go_left = shape == 'left' or (shape == 'zigzag' and node % 2)
+        (left if go_left else right)[node] = node + 1
+    return BinaryTree(range(1, n + 1), left, right)
+
+
+def load_tree(path):
+    """Load a tree from a JSON file in one of the layouts of tree_from_json"""
+    with open(path) as f:
+        return tree_from_json(json.load(f))
+
+
+def tree_from_json(data):
+    """Build a tree from parsed JSON
+
+    Two layouts are accepted: the one written by BinaryTree.save, or
+    {"root": key, "children": {key: [left_key, right_key], ...}} with -1
+    for missing children.
+
+    Raises:
+        KeyError: If a field is missing
+        ValueError: If the data is not a valid tree in either layout
+    """
+    if not isinstance(data, dict):
+        raise ValueError("a tree must be a JSON object")
+    if 'children' in data:
+        if not isinstance(data['children'], dict):
+            raise ValueError("children must map every key to [left, right]")
+        children = {}
+        for key, pair in data['children'].items():
+            if not isinstance(pair, list) or len(pair) != 2:
+                raise ValueError(f"children of {key} must be [left, right]")
+            children[int(key)] = pair
+        return BinaryTree.from_dict(children, data['root'])
+    return BinaryTree(data['keys'], data['left'], data['right'], data['root'])
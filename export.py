@@ -0,0 +1,87 @@
+"""Export an algorithm run to a GIF or video without opening the GUI.
+
+The run is recorded, then replayed frame by frame into an off-screen
+canvas whose pixels are streamed to the encoder. GIFs need only Pillow;
+other formats such as .mp4 are encoded by ffmpeg.
+
+Examples:
+    python export.py --algorithm quick --size 200 --output quick.gif
+    python export.py --traversal morris --tree random --nodes 500 --output morris.mp4
+    python export.py --algorithm insertion --size 300 --length 20 --output insertion.mp4
+"""
+import argparse
+import sys
+import time
+
+from engine.trace import SORTS, TRAVERSALS
+from engine.tree import random_bst, complete_tree, degenerate_tree, load_tree
+from utils.data_generator import DISTRIBUTIONS, generate
+from visualization.exporter import (SortExporter, TraversalExporter, HOLD_SECONDS,
+                                    steps_for_length)
+
+TREE_SHAPES = ('random', 'complete', 'degenerate', 'zigzag')
+
+
+def build_tree(shape, nodes, seed):
+    """Tree of the given shape, or loaded from a JSON file if shape is a path"""
+    if shape == 'random':
+        return random_bst(nodes, seed)
+    if shape == 'complete':
+        return complete_tree(nodes)
+    if shape == 'degenerate':
+        return degenerate_tree(nodes)
+    if shape == 'zigzag':
+        return degenerate_tree(nodes, 'zigzag')
+    return load_tree(shape)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export an algorithm run as a GIF or video")
+    group = parser.add_mutually_exclusive_group(required=True)
+    group.add_argument('--algorithm', choices=sorted(SORTS), help="sort to export")
+    group.add_argument('--traversal', choices=sorted(TRAVERSALS), help="traversal to export")
+    parser.add_argument('--output', required=True,
+                        help="file to write; .gif uses Pillow, anything else ffmpeg")
+    parser.add_argument('--distribution', choices=sorted(DISTRIBUTIONS), default='random')
+    parser.add_argument('--size', type=int, default=50, help="array size for sorts")
+    parser.add_argument('--tree', default='complete',
+                        help=f"tree shape ({', '.join(TREE_SHAPES)}) or a JSON file to load")
+    parser.add_argument('--nodes', type=int, default=31, help="tree size for traversals")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--fps', type=int, default=30)
+    parser.add_argument('--steps-per-frame', type=int, default=1,
+                        help="visible steps merged into each frame")
+    parser.add_argument('--length', type=float,
+                        help="target length in seconds; overrides --steps-per-frame")
+    parser.add_argument('--hold', type=float, default=HOLD_SECONDS,
+                        help="seconds to show the final state")
+    parser.add_argument('--width', type=float, default=8, help="figure width in inches")
+    parser.add_argument('--height', type=float, default=6, help="figure height in inches")
+    parser.add_argument('--dpi', type=int, default=100)
+    args = parser.parse_args(argv)
+
+    figure = dict(figsize=(args.width, args.height), dpi=args.dpi)
+    if args.algorithm:
+        data = generate(args.distribution, args.size, args.seed).tolist()
+        exporter = SortExporter(args.algorithm, data, **figure)
+    else:
+        tree = build_tree(args.tree, args.nodes, args.seed)
+        exporter = TraversalExporter(args.traversal, tree, **figure)
+
+    steps_per_frame = args.steps_per_frame
+    if args.length:
+        steps_per_frame = steps_for_length(exporter.trace, args.fps, args.length,
+                                           exporter.hidden_ops)
+
+    started = time.perf_counter()
+    try:
+        frames = exporter.export(args.output, args.fps, steps_per_frame, args.hold)
+    except RuntimeError as e:
+        sys.exit(f"Export failed: {e}")
+    elapsed = time.perf_counter() - started
+    print(f"Wrote {frames} frames ({len(exporter.trace)} events, "
+          f"{steps_per_frame} steps per frame) to {args.output} in {elapsed:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""Grade submitted sort and traversal answers without the GUI.
+
+Reads test cases from a JSONL file or a directory of .json/.jsonl files
+(see engine/grading.py for the case format), checks every answer against
+the reference result of the same step generators the tabs replay, and
+streams one JSON result per line as cases are graded.
+
+Examples:
+    python grade.py submissions.jsonl --output results.jsonl
+    python grade.py cases/ --failures-only --workers 8
+"""
+import argparse
+import json
+import sys
+import time
+
+from engine.grading import CHUNK_SIZE, PASSED, FAILED, ERROR, grade, read_cases
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Grade sort and traversal answers headlessly")
+    parser.add_argument('cases', help="JSONL file or directory of test cases")
+    parser.add_argument('--output', help="file to write results to (default: stdout)")
+    parser.add_argument('--workers', type=int,
+                        help="worker processes (default: one per CPU, 0 to grade in-process)")
+    parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE,
+                        help="cases sent to a worker at once")
+    parser.add_argument('--failures-only', action='store_true',
+                        help="only write results of cases that did not pass")
+    args = parser.parse_args(argv)
+
+    out = open(args.output, 'w') if args.output else sys.stdout
+    totals = {PASSED: 0, FAILED: 0, ERROR: 0}
+    started = time.perf_counter()
+    try:
+        for result in grade(read_cases(args.cases), args.workers, args.chunk_size):
+            totals[result['status']] += 1
+            if not (args.failures_only and result['status'] == PASSED):
+                out.write(json.dumps(result) + "\n")
+    except (OSError, ValueError) as e:
+        # Unreadable files; bad cases inside readable ones are reported as errors
+        sys.exit(f"Grading failed: {e}")
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    elapsed = time.perf_counter() - started
+
+    print(f"Graded {sum(totals.values())} cases in {elapsed:.2f}s: {totals[PASSED]} passed, "
+          f"{totals[FAILED]} failed, {totals[ERROR]} errors", file=sys.stderr)
+    # Non-zero exit status when any answer was wrong, for scripts
+    if totals[FAILED] or totals[ERROR]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
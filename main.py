@@ -1,40 +1,73 @@
+import argparse
+import time
 import tkinter as tk
 from tkinter import ttk
+from visualization.visualizer import AlgorithmVisualizer
+from engine.cache import TRACES
 
 
-def main():
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Algorithm Visualizer")
+    parser.add_argument('--startup-time', action='store_true',
+                        help="print the time until the first tab is ready and exit")
+    parser.add_argument('--trace-cache', metavar='DIR',
+                        help="also keep recorded runs in DIR, so later sessions replay "
+                             "them without recording them again")
+    args = parser.parse_args(argv)
+    TRACES.directory = args.trace_cache
+    started = time.perf_counter()
+
     root = tk.Tk()
     root.title("Algorithm Visualizer")
     root.geometry("1200x800")
-    
+
     # Create notebook for different algorithm types
     notebook = ttk.Notebook(root)
     notebook.pack(fill=tk.BOTH, expand=True)
-    
-    # Import algorithm visualizers
-    from algorithms.tree_traversal import TreeTraversalVisualizer
-    from algorithms.bubble_sort import BubbleSortVisualizer
-    from algorithms.insertion_sort import InsertionSortVisualizer
-    
-    
-    # Create tabs for each algorithm type
-    tree_frame = ttk.Frame(notebook)
-    bubble_frame = ttk.Frame(notebook)
-    insertion_frame = ttk.Frame(notebook)
- 
-    
-    notebook.add(tree_frame, text="Tree Traversal")
-    notebook.add(bubble_frame, text="Bubble Sort")
-    notebook.add(insertion_frame, text="Insertion Sort")
-    
-    
-    # Initialize visualizers in their respective tabs
-    tree_vis = TreeTraversalVisualizer(tree_frame)
-    bubble_vis = BubbleSortVisualizer(bubble_frame)
-    insertion_vis = InsertionSortVisualizer(insertion_frame)
-  
-    
+
+    # Create an empty tab for each discovered algorithm
+    tabs = AlgorithmVisualizer.discover()
+    frames = []
+    for visualizer_class in tabs:
+        frame = ttk.Frame(notebook)
+        notebook.add(frame, text=visualizer_class.tab_title)
+        frames.append(frame)
+
+    # Visualizers by tab index, built the first time their tab is shown.
+    # All of them draw on one shared canvas, held by the selected tab.
+    visualizers = {}
+    selected = None
+
+    def on_tab_changed(event=None):
+        nonlocal selected
+        index = notebook.index(notebook.select())
+        if index == selected:
+            return
+        if selected in visualizers:
+            visualizers[selected].hide()
+        selected = index
+        if index in visualizers:
+            visualizers[index].show()
+            return
+        visualizers[index] = tabs[index](frames[index])
+
+        # Report how long it took until the first tab could be used
+        if len(visualizers) == 1:
+            root.after_idle(report_startup, visualizers[index])
+
+    def report_startup(visualizer):
+        elapsed = time.perf_counter() - started
+        if args.startup_time:
+            print(f"Startup: {elapsed:.3f}s")
+            root.destroy()
+        else:
+            visualizer.log(f"Started in {elapsed:.2f}s")
+
+    notebook.bind('<<NotebookTabChanged>>', on_tab_changed)
+    # In case the initial selection raised no event
+    root.after_idle(on_tab_changed)
+
     root.mainloop()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,70 @@
+from engine.grading import grade_case, PASSED, FAILED, ERROR
+
+
+def traversal_case(algorithm, tree, answer=()):
+    return {'id': 't', 'kind': 'traversal', 'algorithm': algorithm,
+            'tree': tree, 'answer': list(answer)}
+
+
+def test_valid_traversal_passes():
+    tree = {'root': 2, 'children': {'2': [1, 3], '1': [-1, -1], '3': [-1, -1]}}
+    assert grade_case(traversal_case('inorder', tree, [1, 2, 3]))['status'] == PASSED
+    assert grade_case(traversal_case('preorder', tree, [1, 2, 3]))['status'] == FAILED
+
+
+def test_child_linking_to_root_is_an_error():
+    tree = {'keys': [1, 2], 'left': [1, 0], 'right': [-1, -1], 'root': 0}
+    for algorithm in ('inorder', 'preorder', 'postorder', 'morris'):
+        assert grade_case(traversal_case(algorithm, tree))['status'] == ERROR
+
+
+def test_cycle_through_right_child_is_an_error():
+    tree = {'keys': [1, 2], 'left': [1, -1], 'right': [-1, 0], 'root': 0}
+    for algorithm in ('postorder', 'morris'):
+        assert grade_case(traversal_case(algorithm, tree))['status'] == ERROR
+
+
+def test_node_with_two_parents_is_an_error():
+    tree = {'keys': [1, 2, 3], 'left': [1, 2, -1], 'right': [2, -1, -1], 'root': 0}
+    assert grade_case(traversal_case('inorder', tree))['status'] == ERROR
+
+
+def test_child_index_out_of_range_is_an_error():
+    for child in (-2, 2):
+        tree = {'keys': [1, 2], 'left': [1, child], 'right': [-1, -1], 'root': 0}
+        assert grade_case(traversal_case('inorder', tree))['status'] == ERROR
+
+
+def test_bad_root_is_an_error():
+    tree = {'keys': [1, 2], 'left': [1, -1], 'right': [-1, -1], 'root': 5}
+    assert grade_case(traversal_case('inorder', tree))['status'] == ERROR
+    tree = {'root': 7, 'children': {'1': [-1, -1]}}
+    assert grade_case(traversal_case('inorder', tree))['status'] == ERROR
+
+
+def test_key_beyond_32_bits_is_an_error():
+    tree = {'keys': [2**31], 'left': [-1], 'right': [-1], 'root': 0}
+    result = grade_case(traversal_case('inorder', tree, [2**31]))
+    assert result['status'] == ERROR
+    assert '32-bit' in result['message']
+
+
+def test_malformed_children_layout_is_an_error():
+    for children in ([[1, 2]], {'1': 5}, {'1': [-1]}):
+        tree = {'root': 1, 'children': children}
+        assert grade_case(traversal_case('inorder', tree))['status'] == ERROR
+
+
+def test_unreachable_nodes_are_an_error():
+    for left, right in (([-1, -1, -1], [-1, -1, -1]), ([-1, 2, 1], [-1, -1, -1])):
+        tree = {'keys': [1, 2, 3], 'left': left, 'right': right, 'root': 0}
+        result = grade_case(traversal_case('inorder', tree, [1]))
+        assert result['status'] == ERROR
+        assert 'reached' in result['message']
+
+
+def test_unknown_child_key_is_an_error():
+    tree = {'root': 2, 'children': {'2': [1, 4], '1': [-1, -1], '3': [-1, -1]}}
+    result = grade_case(traversal_case('inorder', tree, [1, 2]))
+    assert result['status'] == ERROR
+    assert "child 4 of 2" in result['message']
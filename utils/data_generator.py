@@ -1,63 +1,191 @@
-import random
+import numpy as np
 
-def generate_random_array(size, min_val=1, max_val=10):
+
+def make_rng(seed=None):
+    """Create the random generator every input is drawn from
+
+    Args:
+        seed (int or numpy.random.Generator): Seed for reproducible inputs.
+            If None, fresh OS entropy is used.
+
+    Returns:
+        numpy.random.Generator: Random generator
+    """
+    return np.random.default_rng(seed)
+
+def generate_random_array(size, min_val=1, max_val=10, seed=None):
     """Generate a random array of integers
-    
+
     Args:
         size (integer): Array size
         min_val (integer): Min value (inclusive)
         max_val (integer): Max value (inclusive)
-    
+        seed (int): Random seed
+
     Returns:
-        list: Random array of integers
+        numpy.ndarray: Random array of integers
     """
-    return [random.randint(min_val, max_val) for _ in range(size)]
+    return make_rng(seed).integers(min_val, max_val, size=size, endpoint=True)
 
-def generate_nearly_sorted_array(size, swaps=None):
+def generate_nearly_sorted_array(size, swaps=None, seed=None):
     """Generate a nearly sorted array by starting with a sorted array
     and performing a few random swaps
-    
+
     Args:
         size (int): Size of the array
         swaps (int): Number of swaps to perform. If None, uses sqrt(size).
-    
+        seed (int): Random seed
+
     Returns:
-        list: Nearly sorted array
+        numpy.ndarray: Nearly sorted array
     """
     if swaps is None:
         swaps = int(size ** 0.5)
-    
+    swaps = min(swaps, size // 2)
+
     # Create sorted array
-    arr = list(range(1, size + 1))
-    
-    # Perform random swaps
-    for _ in range(swaps):
-        i = random.randint(0, size - 1)
-        j = random.randint(0, size - 1)
-        arr[i], arr[j] = arr[j], arr[i]
-    
+    arr = np.arange(1, size + 1)
+
+    # Swap disjoint random pairs, all at once
+    picks = make_rng(seed).choice(size, 2 * swaps, replace=False)
+    i, j = picks[:swaps], picks[swaps:]
+    arr[i], arr[j] = arr[j], arr[i]
+
     return arr
 
-def generate_reversed_array(size):
+def generate_reversed_array(size, seed=None):
     """Generate a reversed (sorted in descending order) array
-    
+
     Args:
         size (int): Size of the array
-    
+        seed (int): Unused; accepted so every generator has the same signature
+
     Returns:
-        list: Reversed array
+        numpy.ndarray: Reversed array
     """
-    return list(range(size, 0, -1))
+    return np.arange(size, 0, -1)
 
-def generate_few_unique_array(size, unique_vals=3):
+def generate_few_unique_array(size, unique_vals=3, seed=None):
     """Generate an array with few unique values
-    
+
     Args:
         size (int): Size of the array
         unique_vals (int): Number of unique values
-    
+        seed (int): Random seed
+
+    Returns:
+        numpy.ndarray: Array with few unique values
+    """
+    return make_rng(seed).integers(1, unique_vals, size=size, endpoint=True)
+
+def generate_many_duplicates_array(size, unique_vals=None, seed=None):
+    """Generate an array where every value appears many times
+
+    Args:
+        size (int): Size of the array
+        unique_vals (int): Number of distinct values. If None, uses sqrt(size).
+        seed (int): Random seed
+
+    Returns:
+        numpy.ndarray: Array with many duplicates
+    """
+    if unique_vals is None:
+        unique_vals = max(int(size ** 0.5), 1)
+    return make_rng(seed).integers(1, unique_vals, size=size, endpoint=True)
+
+def generate_zipf_array(size, exponent=1.5, max_val=None, seed=None):
+    """Generate an array following a Zipf distribution: a few values are
+    very common and most are rare
+
+    Args:
+        size (int): Size of the array
+        exponent (float): Zipf exponent, greater than 1
+        max_val (int): Values above this are clipped. If None, uses size.
+        seed (int): Random seed
+
     Returns:
-        list: Array with few unique values
+        numpy.ndarray: Zipf-distributed array
     """
-    values = list(range(1, unique_vals + 1))
-    return [random.choice(values) for _ in range(size)]
\ No newline at end of file
+    if max_val is None:
+        max_val = max(size, 1)
+    return np.minimum(make_rng(seed).zipf(exponent, size=size), max_val)
+
+def generate_sawtooth_array(size, teeth=4, seed=None):
+    """Generate an array of several ascending runs
+
+    Args:
+        size (int): Size of the array
+        teeth (int): Number of ascending runs
+        seed (int): Unused; accepted so every generator has the same signature
+
+    Returns:
+        numpy.ndarray: Sawtooth array
+    """
+    tooth = max(-(-size // teeth), 1)
+    return np.arange(size) % tooth + 1
+
+def generate_organ_pipe_array(size, seed=None):
+    """Generate an array that ascends to the middle and then descends
+
+    Args:
+        size (int): Size of the array
+        seed (int): Unused; accepted so every generator has the same signature
+
+    Returns:
+        numpy.ndarray: Organ-pipe array
+    """
+    idx = np.arange(size)
+    return np.minimum(idx, size - 1 - idx) + 1
+
+def generate_k_sorted_array(size, k=10, seed=None):
+    """Generate an array where every element is at most k positions away
+    from its sorted position
+
+    Args:
+        size (int): Size of the array
+        k (int): Maximum displacement
+        seed (int): Random seed
+
+    Returns:
+        numpy.ndarray: k-sorted array
+    """
+    arr = np.arange(1, size + 1)
+    block = k + 1
+    full = size - size % block
+    rng = make_rng(seed)
+
+    # Shuffling within blocks of k + 1 moves nothing further than k
+    arr[:full] = rng.permuted(arr[:full].reshape(-1, block), axis=1).ravel()
+    arr[full:] = rng.permutation(arr[full:])
+    return arr
+
+# Every input distribution, by name
+DISTRIBUTIONS = {
+    'random': generate_random_array,
+    'nearly_sorted': generate_nearly_sorted_array,
+    'reversed': generate_reversed_array,
+    'few_unique': generate_few_unique_array,
+    'many_duplicates': generate_many_duplicates_array,
+    'zipf': generate_zipf_array,
+    'sawtooth': generate_sawtooth_array,
+    'organ_pipe': generate_organ_pipe_array,
+    'k_sorted': generate_k_sorted_array,
+}
+
+def generate(distribution, size, seed=None, **kwargs):
+    """Generate an input array from a named distribution
+
+    Args:
+        distribution (str): Key in DISTRIBUTIONS
+        size (int): Size of the array
+        seed (int): Random seed; the same seed always gives the same array
+        **kwargs: Extra arguments for the distribution's generator
+
+    Returns:
+        numpy.ndarray: Generated array
+    """
+    return DISTRIBUTIONS[distribution](size, seed=seed, **kwargs)
+
+def new_seed():
+    """Pick a fresh seed that can be logged to reproduce a run"""
+    return int(np.random.SeedSequence().entropy % (2 ** 32))
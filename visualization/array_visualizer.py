@@ -0,0 +1,225 @@
+import tkinter as tk
+from tkinter import ttk
+import logging
+from concurrent.futures import ProcessPoolExecutor, BrokenExecutor
+from visualization.visualizer import AlgorithmVisualizer
+from visualization.playback import ArrayPlayback, Timeline
+from engine.cache import TRACES
+from engine.trace import QUADRATIC_SORTS, record_sort
+from utils.data_generator import DISTRIBUTIONS, generate, new_seed
+
+class ArrayAlgorithmVisualizer(ArrayPlayback, AlgorithmVisualizer):
+    """Base for visualizers that sort an array shown as a bar chart
+
+    A subclass only names its tab and its step generator:
+
+        class SelectionSortVisualizer(ArrayAlgorithmVisualizer):
+            tab_title = "Selection Sort"
+            algorithm = 'selection'    # Key in engine.trace.SORTS
+
+    The array controls, data generation, recording and replay are shared,
+    and the coloring comes from ArrayPlayback; apply_step can be overridden
+    for algorithm-specific colors and log messages.
+
+    Runs that are not cached are recorded in a worker process while the
+    window stays responsive, and replayed once the recording is in.
+    """
+
+    # Key in engine.trace.SORTS of the step generator to run
+    algorithm = None
+
+    # Optional {label: SORTS key} of variants to pick from instead
+    variants = None
+
+    # Longer arrays are logged by their length instead of their values
+    MAX_LOGGED_VALUES = 100
+
+    # Longest array a sort in QUADRATIC_SORTS is recorded for
+    MAX_QUADRATIC_SIZE = 3000
+
+    def __init__(self, parent):
+        self.pool = None
+        self.recording = None   # (key, future) of the latest recording
+        self.awaited = None     # Key of the recording Start is waiting for
+        self.start_paused = False   # Step was pressed while recording
+        super().__init__(parent)
+
+        # Variant selection, for tabs that offer more than one
+        if self.variants:
+            ttk.Label(self.control_frame, text="Variant:").pack(side=tk.LEFT, padx=5, pady=5)
+            self.variant_var = tk.StringVar(value=next(iter(self.variants)))
+            ttk.Combobox(self.control_frame, textvariable=self.variant_var,
+                         values=tuple(self.variants), width=16,
+                         state='readonly').pack(side=tk.LEFT, padx=5, pady=5)
+
+        # Add array size control
+        ttk.Label(self.control_frame, text="Array Size:").pack(side=tk.LEFT, padx=5, pady=5)
+        self.size_var = tk.IntVar(value=15)
+        self.size_spinbox = ttk.Spinbox(self.control_frame, from_=5, to=1000000,
+                                        textvariable=self.size_var, width=8)
+        self.size_spinbox.pack(side=tk.LEFT, padx=5, pady=5)
+
+        # Input distribution and seed; an empty seed picks a new one
+        ttk.Label(self.control_frame, text="Input:").pack(side=tk.LEFT, padx=5, pady=5)
+        self.distribution_var = tk.StringVar(value='random')
+        ttk.Combobox(self.control_frame, textvariable=self.distribution_var,
+                     values=tuple(DISTRIBUTIONS), width=14,
+                     state='readonly').pack(side=tk.LEFT, padx=5, pady=5)
+        ttk.Label(self.control_frame, text="Seed:").pack(side=tk.LEFT, padx=5, pady=5)
+        self.seed_var = tk.StringVar()
+        ttk.Entry(self.control_frame, textvariable=self.seed_var,
+                  width=10).pack(side=tk.LEFT, padx=5, pady=5)
+
+        # Generate new data button
+        ttk.Button(self.control_frame, text="New Data",
+                  command=self.reset).pack(side=tk.LEFT, padx=5, pady=5)
+
+        # Initialize the array and visualization
+        self.setup_data()
+        self.fig, self.ax = self.setup_canvas()
+        self.setup_renderer()
+
+    def setup_data(self):
+        self.clear_log()
+
+        # Generate the array; logging the seed makes the run reproducible
+        size = self.size_var.get()
+        distribution = self.distribution_var.get()
+        try:
+            seed = int(self.seed_var.get())
+        except ValueError:
+            if self.seed_var.get().strip():
+                self.log(f"Invalid seed {self.seed_var.get()!r}, using a random one",
+                         logging.WARNING)
+            seed = new_seed()
+        self.set_array(generate(distribution, size, seed).tolist())
+        self.log(f"Generated new array ({distribution}, seed {seed}): "
+                 f"{self.describe_array()}")
+        if hasattr(self, 'renderer'):
+            self.setup_renderer()
+
+    def setup_renderer(self):
+        """Draw the new array, switching between bars and a column image
+        when its size calls for the other one"""
+        self.renderer = self.make_renderer(self.ax, self.canvas, self.tab_title,
+                                           getattr(self, 'renderer', None))
+        self.renderer.reset(self.array, self.states)
+
+    def describe_array(self):
+        """The array's values for the log, or only its length if it is long"""
+        if len(self.array) > self.MAX_LOGGED_VALUES:
+            return f"{len(self.array)} values"
+        return str(self.array.tolist())
+
+    def update_visualization(self):
+        # Only bars whose height or state changed are redrawn
+        self.renderer.update(self.array, self.states)
+
+    def get_algorithm(self):
+        """SORTS key of the algorithm to run, following the variant picked"""
+        if self.variants:
+            return self.variants[self.variant_var.get()]
+        return self.algorithm
+
+    def start(self):
+        if self.variants:
+            self.log(f"Starting {self.tab_title} ({self.variant_var.get()})")
+        else:
+            self.log(f"Starting {self.tab_title}")
+
+        # Return every bar to the default state
+        self.reset_colors()
+        self.update_visualization()
+
+        algorithm = self.get_algorithm()
+        if algorithm in QUADRATIC_SORTS and len(self.array) > self.MAX_QUADRATIC_SIZE:
+            self.log(f"This sort takes about n^2 / 2 steps; use at most "
+                     f"{self.MAX_QUADRATIC_SIZE:,} values", logging.WARNING)
+            self.flush_log()
+            return
+
+        # Replay the recording of an earlier run on the same values, or
+        # record the run headlessly in a worker and replay it when done
+        self.cancel()
+        key = TRACES.key(algorithm, self.array)
+        trace = TRACES.get(key)
+        if trace is not None:
+            self.play_recording(trace)
+            return
+        if self.recording is None or self.recording[0] != key:
+            if self.recording is not None:
+                self.recording[1].cancel()
+            self.recording = (key, self.submit(record_sort, algorithm,
+                                               self.array.tolist()))
+        self.log(f"Recording {len(self.array):,} values...")
+        self.flush_log()
+        self.awaited = key
+        self.parent.after(50, self.poll_recording, key)
+
+    def poll_recording(self, key):
+        """Replay the recording Start asked for once it is done"""
+        if self.awaited != key:
+            return
+        future = self.recording[1]
+        if not future.done():
+            self.parent.after(50, self.poll_recording, key)
+            return
+        self.awaited = None
+        self.recording = None
+        try:
+            trace = future.result()
+        except Exception as e:
+            # Includes a worker dying; submit() replaces the broken pool
+            self.start_paused = False
+            self.log(f"Recording failed: {e!r}", logging.ERROR)
+            self.flush_log()
+            return
+        TRACES.put(key, trace)
+        self.play_recording(trace)
+
+    def submit(self, fn, *args):
+        """Run fn(*args) in the tab's worker processes
+
+        The pool is started on first use, and started anew if a worker
+        died, which breaks it for every later job.
+
+        Returns:
+            Future: The pending result
+        """
+        if self.pool is not None:
+            try:
+                return self.pool.submit(fn, *args)
+            except BrokenExecutor:
+                self.pool.shutdown(wait=False)
+        self.pool = ProcessPoolExecutor()
+        return self.pool.submit(fn, *args)
+
+    def play_recording(self, trace):
+        """Replay a recorded run's steps onto self.array, or only its
+        first step if Step was pressed while it was recorded"""
+        paused, self.start_paused = self.start_paused, False
+        self.trace = trace
+        self.play_timeline(Timeline(self, trace))
+        if paused:
+            self.step()
+
+    def step(self):
+        if self.steps is None and self.awaited is None:
+            self.start()
+            if self.steps is None and self.awaited is None:
+                return
+        if self.awaited is not None:
+            # The first step is shown once the recording is in
+            self.start_paused = True
+            return
+        super().step()
+
+    def cancel(self):
+        # A recording still running is kept, so starting the same run
+        # again picks it up instead of recording it twice
+        self.awaited = None
+        self.start_paused = False
+        super().cancel()
+
+    def on_finished(self):
+        self.log(f"sorted array = {self.describe_array()}")
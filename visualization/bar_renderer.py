@@ -0,0 +1,152 @@
+import time
+
+import numpy as np
+from matplotlib.colors import to_rgba
+from matplotlib.transforms import Bbox
+from matplotlib.ticker import MaxNLocator
+
+from visualization.blit_renderer import BlitRenderer
+
+
+class BarChartRenderer(BlitRenderer):
+    """Draws an array as a bar chart whose bars are created once and
+    updated in place.
+
+    The axes, ticks and labels are rendered into a cached background. Bars
+    are animated artists: after a change only the columns of the bars that
+    changed are restored from the background, redrawn and blitted.
+
+    Bars are colored by state: every element has a small integer state
+    that indexes the palette, converted to RGBA once up front.
+
+    Args:
+        ax: Axes to draw in
+        canvas: Canvas of the axes
+        palette (sequence): Color of every state
+        title (str): Axes title
+        blit (bool): Blit changes right away, or collect them in blit_boxes
+    """
+
+    # Above this size every-index tick labels become unreadable
+    MAX_LABELED_TICKS = 50
+
+    def __init__(self, ax, canvas, palette, title="", blit=True):
+        super().__init__(ax, canvas, title, blit)
+        self.palette = [to_rgba(color) for color in palette]
+        self.bars = None
+        self.heights = []
+        self.states = bytearray()
+
+    def reset(self, values, states, draw=True):
+        """Rebuild the bar container for a new array and redraw everything
+
+        Args:
+            values (sequence): Array values
+            states (sequence): State of every bar, an index into the palette
+            draw (bool): Redraw the canvas now. Owners of several renderers
+                on one canvas pass False and draw once when all are reset.
+        """
+        self.ax.clear()
+        self.heights = list(values)
+        self.states = bytearray(states)
+        n = len(self.heights)
+
+        # Bars are animated so a full draw leaves them out of the background
+        colors = np.array(self.palette)[np.asarray(self.states, dtype=np.intp)]
+        self.bars = self.ax.bar(range(n), self.heights, color=colors,
+                                animated=True)
+
+        # Set plot properties once; they never change during a run
+        self.ax.set_title(self.title)
+        self.ax.set_xlabel("Index")
+        self.ax.set_ylabel("Value")
+        if n <= self.MAX_LABELED_TICKS:
+            self.ax.set_xticks(range(n))
+            self.ax.set_xticklabels(range(n))
+        else:
+            self.ax.xaxis.set_major_locator(MaxNLocator(integer=True))
+        self.ax.set_xlim(-0.5, n - 0.5)
+        self.ax.set_ylim(0, max(self.heights, default=1) * 1.1)
+
+        self.background = None
+        if draw:
+            self.canvas.draw()
+
+    def update(self, values, states, indices=None):
+        """Update the bars whose height or state changed.
+
+        Args:
+            values (sequence): Current array values
+            states (sequence): Current state of every bar
+            indices (iterable): Indices known to have changed. If None, every
+                bar is compared against the last drawn state.
+        """
+        if self.bars is None or len(values) != len(self.heights):
+            self.reset(values, states)
+            return
+
+        if indices is None:
+            indices = range(len(values))
+
+        dirty = []
+        for i in indices:
+            value, state = values[i], states[i]
+            if value != self.heights[i]:
+                self.heights[i] = value
+                self.bars[i].set_height(value)
+                dirty.append(i)
+            if state != self.states[i]:
+                self.states[i] = state
+                self.bars[i].set_facecolor(self.palette[state])
+                if not dirty or dirty[-1] != i:
+                    dirty.append(i)
+
+        if not dirty:
+            return
+        started = time.perf_counter()
+        if self.background is None:
+            self.canvas.draw()
+        elif self.ax.bbox.bounds != self.background_bounds:
+            # The figure was resized and its redraw is still to come; it
+            # shows the new heights and caches a background of the new size
+            self.canvas.draw_idle()
+        else:
+            for lo, hi in self._runs(dirty):
+                self._blit_columns(lo, hi)
+        self.draw_seconds += time.perf_counter() - started
+
+    def _runs(self, indices):
+        """Group dirty indices into contiguous (lo, hi) runs"""
+        indices = sorted(set(indices))
+        lo = prev = indices[0]
+        for i in indices[1:]:
+            if i != prev + 1:
+                yield lo, prev
+                lo = i
+            prev = i
+        yield lo, prev
+
+    def _blit_columns(self, lo, hi):
+        """Restore, redraw and blit the columns of bars lo..hi"""
+        ax_box = self.ax.bbox
+        to_display = self.ax.transData.transform
+        x1 = max(to_display((lo - 0.5, 0))[0], ax_box.x0)
+        x2 = min(to_display((hi + 0.5, 0))[0], ax_box.x1)
+        x1, x2 = int(x1), int(x2) + 1
+        self._restore_columns(x1, x2)
+
+        # Neighbours may have been partly covered by the pixel rounding above
+        n = len(self.bars)
+        for i in range(max(lo - 1, 0), min(hi + 2, n)):
+            self.ax.draw_artist(self.bars[i])
+
+        self._blit(Bbox.from_extents(x1, ax_box.y0, x2, ax_box.y1))
+
+    def _on_draw(self, event):
+        """Cache the static background after every full draw, then paint the
+        animated bars on top of it"""
+        if self.bars is None:
+            return
+        self._save_background()
+        for bar in self.bars:
+            self.ax.draw_artist(bar)
@@ -0,0 +1,79 @@
+class BlitRenderer:
+    """Base for renderers that redraw only what changed.
+
+    The axes are rendered into a background cached after every full draw,
+    and the renderer's own artists are animated. A change restores a part
+    of the background, redraws the artists over it and blits that part.
+
+    Several renderers can share one canvas, one per axes. With blit=False
+    the changed regions are collected in blit_boxes instead, so that the
+    owner of the canvas can blit them all at once.
+
+    Args:
+        ax: Axes to draw in
+        canvas: Canvas of the axes
+        title (str): Axes title
+        blit (bool): Blit changes right away, or collect them in blit_boxes
+    """
+
+    def __init__(self, ax, canvas, title="", blit=True):
+        self.ax = ax
+        self.canvas = canvas
+        self.title = title
+        self.blit = blit
+        self.blit_boxes = []
+        self.background = None
+        self.background_bounds = None   # Axes extent the background was cached at
+        self.draw_seconds = 0.0     # Time spent drawing and blitting, for stats
+        self._draw_cid = self.canvas.mpl_connect('draw_event', self._on_draw)
+
+    def disconnect(self):
+        """Stop following the canvas' redraws, before the axes are removed"""
+        self.canvas.mpl_disconnect(self._draw_cid)
+
+    def release(self):
+        """Forget the cached background, while the tab is hidden"""
+        self.background = None
+
+    def set_title(self, title, draw=True):
+        """Change the axes title, redrawing the background if it changed"""
+        if title != self.title:
+            self.title = title
+            self.ax.set_title(title)
+            if draw:
+                self.canvas.draw()
+
+    # The saved background uses Agg's top-down pixel rows with inclusive
+    # ends, and restore_region's xy is where the region's own origin lands,
+    # not the restored sub-box. The helpers below take canvas pixels.
+
+    def _restore_columns(self, x1, x2):
+        """Restore pixel columns x1..x2, both included, over the axes' height"""
+        rx1, ry1, _, ry2 = self.background.get_extents()
+        self.canvas.restore_region(self.background, bbox=(x1, ry1, x2, ry2),
+                                   xy=(rx1, ry1))
+
+    def _restore_box(self, x1, y1, x2, y2):
+        """Restore the pixels from (x1, y1) up to but excluding (x2, y2)"""
+        height = int(self.canvas.figure.bbox.height)
+        rx1, ry1, _, _ = self.background.get_extents()
+        self.canvas.restore_region(self.background,
+                                   bbox=(x1, height - y2, x2 - 1, height - y1 - 1),
+                                   xy=(rx1, ry1))
+
+    def _blit(self, box):
+        """Blit a redrawn box, or collect it for the canvas' owner"""
+        if self.blit:
+            self.canvas.blit(box)
+        else:
+            self.blit_boxes.append(box)
+
+    def _save_background(self):
+        """Cache the freshly drawn axes as the background"""
+        self.background = self.canvas.copy_from_bbox(self.ax.bbox)
+        self.background_bounds = self.ax.bbox.bounds
+
+    def _on_draw(self, event):
+        """Called after every full draw, to cache the background and paint
+        the animated artists on top of it"""
+        pass
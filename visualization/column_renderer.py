@@ -0,0 +1,215 @@
+import time
+
+import numpy as np
+from matplotlib.colors import to_rgba_array
+from matplotlib.ticker import MaxNLocator
+from matplotlib.transforms import Bbox
+
+from visualization.blit_renderer import BlitRenderer
+
+
+class ColumnImageRenderer(BlitRenderer):
+    """Draws a large array as an image with one column per screen pixel.
+
+    Drawing one rectangle per element stops being practical once there are
+    many more elements than pixels. Instead every pixel column aggregates
+    the elements underneath it: it is filled solid up to the smallest value
+    and in a lighter shade up to the largest one, in the most important
+    state among its elements. The image lives in a NumPy buffer with exactly
+    one pixel per screen pixel of the axes, so it is copied to the canvas
+    as it is, without the resampling an imshow artist would need.
+
+    A change only recomputes the columns of the elements that changed, and
+    only those columns are restored from the cached background, redrawn
+    and blitted. Work per frame therefore depends on the screen size and on
+    what changed, never on the length of the array.
+
+    Takes the same calls as BarChartRenderer, so the two are
+    interchangeable.
+
+    Args:
+        ax: Axes to draw in
+        canvas: Canvas of the axes
+        palette (sequence): Color of every state
+        title (str): Axes title
+        blit (bool): Blit changes right away, or collect them in blit_boxes
+        quiet_states (tuple): States that lose to any other state when
+            elements of a column differ, least important first
+    """
+
+    # Runs of dirty columns closer than this many pixels are drawn together
+    MERGE_GAP = 8
+
+    def __init__(self, ax, canvas, palette, title="", blit=True, quiet_states=()):
+        super().__init__(ax, canvas, title, blit)
+
+        # Solid and light pixel of every state, and a rank whose high bits
+        # hold the state's importance, so that the largest rank in a column
+        # names the state to show in its low byte
+        self.solid = (to_rgba_array(palette) * 255).astype(np.uint8)
+        self.light = self.solid.copy()
+        self.light[:, 3] //= 3
+        importance = np.full(len(palette), len(quiet_states), dtype=np.int32)
+        importance[list(quiet_states)] = np.arange(len(quiet_states))
+        self.ranks = (importance << 8) | np.arange(len(palette), dtype=np.int32)
+
+        self.values = None
+
+    def reset(self, values, states, draw=True):
+        """Take a new array and redraw everything
+
+        Args:
+            values (sequence): Array values
+            states (sequence): State of every element, an index into the
+                palette
+            draw (bool): Redraw the canvas now
+        """
+        self.ax.clear()
+        n = len(values)
+
+        # Copies of what is on screen, to find what changed
+        self.values = np.array(values, dtype=np.int64)
+        self.states = np.array(states, dtype=np.uint8)
+        self.top = max((int(self.values.max()) if n else 1) * 1.1, 1)
+
+        self.ax.set_title(self.title)
+        self.ax.set_xlabel("Index")
+        self.ax.set_ylabel("Value")
+        self.ax.xaxis.set_major_locator(MaxNLocator(integer=True))
+        self.ax.set_xlim(-0.5, n - 0.5)
+        self.ax.set_ylim(0, self.top)
+        self.x0 = self.y0 = self.width = self.height = 0
+
+        self.background = None
+        if draw:
+            self.canvas.draw()
+
+    def _extent(self):
+        """Axes area in whole canvas pixels: left, bottom, width, height"""
+        box = self.ax.bbox
+        x0, y0 = int(round(box.x0)), int(round(box.y0))
+        return (x0, y0, max(int(round(box.x1)) - x0, 1),
+                max(int(round(box.y1)) - y0, 1))
+
+    def _layout(self):
+        """Size the pixel buffer to the axes and assign elements to columns"""
+        self.x0, self.y0, self.width, self.height = self._extent()
+        n = len(self.values)
+        columns = np.arange(self.width + 1, dtype=np.int64)
+
+        # Column c shows elements lo[c]..hi[c]-1, at least one of them
+        self.lo = columns[:-1] * n // self.width
+        self.hi = np.maximum(self.lo + 1, -(-columns[1:] * n // self.width))
+        self.pixels = np.zeros((self.height, self.width, 4), dtype=np.uint8)
+        if n:
+            self._paint(np.arange(self.width))
+
+    def _paint(self, cols):
+        """Recompute the given columns of the pixel buffer"""
+        # Gather the elements under the columns, so that the cost follows
+        # the columns being painted rather than the whole array
+        lo, hi = self.lo[cols], self.hi[cols]
+        sizes = hi - lo
+        starts = np.concatenate([[0], np.cumsum(sizes)[:-1]])
+        elements = np.arange(sizes.sum()) + np.repeat(lo - starts, sizes)
+        low = np.minimum.reduceat(self.values[elements], starts)
+        high = np.maximum.reduceat(self.values[elements], starts)
+        state = np.maximum.reduceat(self.ranks[self.states[elements]], starts) & 0xFF
+
+        scale = self.height / self.top
+        low = np.clip(np.rint(low * scale), 0, self.height).astype(np.int64)
+        high = np.clip(np.rint(high * scale), 0, self.height).astype(np.int64)
+        # Row r covers values up to (r + 1) / scale, bottom row first as
+        # draw_image expects
+        rows = np.arange(1, self.height + 1)[:, None]
+        solid = rows <= low
+        band = (rows > low) & (rows <= high)
+        block = np.zeros((self.height, len(cols), 4), dtype=np.uint8)
+        block[solid] = np.broadcast_to(self.solid[state], block.shape)[solid]
+        block[band] = np.broadcast_to(self.light[state], block.shape)[band]
+        self.pixels[:, cols] = block
+
+    def update(self, values, states, indices=None):
+        """Update the columns of the elements whose value or state changed.
+
+        Args:
+            values (sequence): Current array values
+            states (sequence): Current state of every element
+            indices (iterable): Indices known to have changed. If None, every
+                element is compared against the last drawn state.
+        """
+        n = len(values)
+        if self.values is None or n != len(self.values):
+            self.reset(values, states)
+            return
+
+        if indices is None or len(indices) > n // 8:
+            # Comparing everything at once beats going element by element;
+            # array and bytearray buffers are viewed without copying
+            values, states = np.asarray(values), np.asarray(states)
+            dirty = np.flatnonzero((values != self.values) | (states != self.states))
+            self.values[dirty] = values[dirty]
+            self.states[dirty] = states[dirty]
+        else:
+            dirty = [i for i in indices
+                     if values[i] != self.values[i] or states[i] != self.states[i]]
+            for i in dirty:
+                self.values[i] = values[i]
+                self.states[i] = states[i]
+        if len(dirty) == 0:
+            return
+
+        started = time.perf_counter()
+        if self.background is None or self.width == 0:
+            self.canvas.draw()
+        elif self._extent() != (self.x0, self.y0, self.width, self.height):
+            # Resized but not redrawn yet: the pending redraw lays out the
+            # columns again and paints them with the values stored above
+            self.canvas.draw_idle()
+        else:
+            # Every column showing one of the changed elements; with fewer
+            # elements than columns one element spans several
+            dirty = np.asarray(dirty)
+            first = np.searchsorted(self.hi, dirty, side='right')
+            last = np.searchsorted(self.lo, dirty, side='right') - 1
+            spans = last - first + 1
+            offsets = np.concatenate([[0], np.cumsum(spans)[:-1]])
+            cols = np.unique(np.arange(spans.sum()) + np.repeat(first - offsets, spans))
+            self._paint(cols)
+            for lo, hi in self._runs(cols):
+                self._blit_columns(lo, hi)
+        self.draw_seconds += time.perf_counter() - started
+
+    def _runs(self, cols):
+        """Group sorted column numbers into (lo, hi) runs, joining close ones"""
+        breaks = np.flatnonzero(np.diff(cols) > self.MERGE_GAP)
+        starts = np.concatenate([[0], breaks + 1])
+        ends = np.concatenate([breaks, [len(cols) - 1]])
+        return zip(cols[starts], cols[ends])
+
+    def _blit_columns(self, lo, hi):
+        """Restore, redraw and blit pixel columns lo..hi of the image"""
+        x1, x2 = self.x0 + lo, self.x0 + hi + 1
+
+        # Stop short of x2, which belongs to the next column
+        self._restore_columns(x1, x2 - 1)
+        self._draw_pixels(lo, hi + 1)
+        self._blit(Bbox.from_extents(x1, self.y0, x2, self.y0 + self.height))
+
+    def _draw_pixels(self, lo, hi):
+        """Paint pixel columns lo..hi-1 of the buffer onto the canvas"""
+        renderer = self.canvas.get_renderer()
+        gc = renderer.new_gc()
+        renderer.draw_image(gc, self.x0 + lo, self.y0,
+                            np.ascontiguousarray(self.pixels[:, lo:hi]))
+        gc.restore()
+
+    def _on_draw(self, event):
+        """Cache the static background after every full draw, then paint the
+        image on top of it, resizing it if the axes changed size"""
+        if self.values is None:
+            return
+        self._save_background()
+        if self._extent() != (self.x0, self.y0, self.width, self.height):
+            self._layout()
+        self._draw_pixels(0, self.width)
@@ -0,0 +1,256 @@
+"""Offline rendering of algorithm runs to GIF or video files.
+
+A recorded run is replayed into an off-screen Agg canvas with the same
+renderers and coloring as the GUI tabs, so bars and nodes are persistent
+artists and each frame only redraws what changed. Every frame's pixels are
+read straight from the canvas buffer and handed to a writer that encodes
+them immediately; no frames are kept in memory.
+
+GIFs are written with Pillow. Other formats (.mp4, .webm, ...) are encoded
+by piping raw RGBA frames into ffmpeg, which must be on the PATH.
+"""
+import logging
+import math
+import os
+import shutil
+import subprocess
+
+from algorithms.steps import OP_NAMES
+from engine.trace import record_sort, record_traversal
+from visualization.playback import ArrayPlayback, TreePlayback
+
+# Seconds the final state stays on screen at the end of every export
+HOLD_SECONDS = 1.0
+
+
+class GifWriter:
+    """Encode frames into an animated GIF one frame at a time
+
+    Pillow's save(append_images=...) needs every frame up front, so the
+    file is assembled from Pillow's per-frame GIF encoder instead. After
+    the first frame only the rectangle that changed since the previous
+    frame is stored, and only that rectangle is quantized to a palette of
+    its own, which keeps both the file and the encoding time small.
+    """
+
+    def __init__(self, path, size, fps):
+        self.path = path
+        self.size = size
+        # GIF delays are whole hundredths of a second
+        self.duration = max(round(100 / fps), 2) * 10
+        self.file = open(path, 'wb')
+        self.previous = None
+        self.frames = 0
+
+    def write(self, buffer, repeat=1):
+        """Add a frame shown for repeat frame periods
+
+        Args:
+            buffer: RGBA pixels of the frame, row by row from the top
+            repeat (int): Number of frame periods to show it for
+        """
+        import numpy as np
+        from PIL import Image, GifImagePlugin
+
+        width, height = self.size
+        pixels = np.frombuffer(buffer, dtype=np.uint8).reshape(height, width, 4)
+        if self.previous is None:
+            x1, y1, x2, y2 = 0, 0, width, height
+        else:
+            # One 32-bit word per pixel makes the comparison cheap
+            changed = (pixels.view(np.uint32)[:, :, 0] !=
+                       self.previous.view(np.uint32)[:, :, 0])
+            rows = np.flatnonzero(changed.any(axis=1))
+            cols = np.flatnonzero(changed.any(axis=0))
+            if len(rows):
+                x1, y1, x2, y2 = cols[0], rows[0], cols[-1] + 1, rows[-1] + 1
+            else:
+                # Nothing changed; a single unchanged pixel carries the delay
+                x1, y1, x2, y2 = 0, 0, 1, 1
+        self.previous = pixels.copy()
+
+        patch = Image.fromarray(pixels[y1:y2, x1:x2, :3])
+        frame = patch.quantize(256)
+        if self.frames == 0:
+            for chunk in GifImagePlugin.getheader(frame, info={'loop': 0})[0]:
+                self.file.write(chunk)
+        for chunk in GifImagePlugin.getdata(frame, offset=(int(x1), int(y1)),
+                                            duration=self.duration * repeat,
+                                            include_color_table=True):
+            self.file.write(chunk)
+        self.frames += repeat
+
+    def close(self):
+        self.file.write(b';')  # GIF trailer
+        self.file.close()
+
+
+class FFmpegWriter:
+    """Encode frames into a video by piping raw RGBA pixels to ffmpeg"""
+
+    def __init__(self, path, size, fps, codec='libx264'):
+        executable = shutil.which('ffmpeg')
+        if executable is None:
+            raise RuntimeError("ffmpeg was not found on the PATH; "
+                               "export to a .gif file instead or install ffmpeg")
+        width, height = size
+        command = [executable, '-y', '-loglevel', 'error',
+                   '-f', 'rawvideo', '-pix_fmt', 'rgba',
+                   '-s', f"{width}x{height}", '-r', str(fps), '-i', '-',
+                   # Most players need even dimensions for yuv420p
+                   '-vf', 'pad=ceil(iw/2)*2:ceil(ih/2)*2',
+                   '-pix_fmt', 'yuv420p']
+        if os.path.splitext(path)[1].lower() in ('.mp4', '.mkv', '.mov'):
+            command += ['-vcodec', codec]
+        self.process = subprocess.Popen(command + [path], stdin=subprocess.PIPE)
+        self.frames = 0
+
+    def write(self, buffer, repeat=1):
+        """Add a frame shown for repeat frame periods"""
+        for _ in range(repeat):
+            self.process.stdin.write(buffer)
+        self.frames += repeat
+
+    def close(self):
+        self.process.stdin.close()
+        if self.process.wait() != 0:
+            raise RuntimeError(f"ffmpeg failed with exit code {self.process.returncode}")
+
+
+def open_writer(path, size, fps):
+    """Writer for path, chosen by its extension"""
+    if path.lower().endswith('.gif'):
+        return GifWriter(path, size, fps)
+    return FFmpegWriter(path, size, fps)
+
+
+def offscreen_axes(figsize, dpi):
+    """Figure, axes and Agg canvas that are never shown on screen"""
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+    fig = Figure(figsize=figsize, dpi=dpi)
+    canvas = FigureCanvasAgg(fig)
+    ax = fig.add_subplot()
+    return fig, ax, canvas
+
+
+class Exporter:
+    """Replays a recorded run onto an off-screen canvas, frame by frame
+
+    Subclasses mix in the playback state of their kind of run and build
+    its renderer. Log messages of the replay are dropped.
+
+    Args:
+        trace (Trace): Run to replay
+        figsize (tuple): Figure size in inches
+        dpi (int): Pixels per inch; frames are figsize * dpi pixels
+    """
+
+    def __init__(self, trace, figsize=(8, 6), dpi=100):
+        self.trace = trace
+        self.fig, self.ax, self.canvas = offscreen_axes(figsize, dpi)
+
+    @property
+    def size(self):
+        """Width and height of a frame in pixels"""
+        return self.canvas.get_width_height()
+
+    def log(self, message, level=logging.INFO):
+        pass
+
+    def log_enabled(self, level=logging.INFO):
+        return False
+
+    def frames(self, steps_per_frame=1):
+        """Replay the trace, yielding the canvas pixels after every frame
+
+        Args:
+            steps_per_frame (int): Visible steps coalesced into one frame
+
+        Yields:
+            memoryview: RGBA buffer of the canvas. It is only valid until
+                the next frame is drawn.
+        """
+        self.canvas.draw()
+        yield self.canvas.buffer_rgba()
+        shown = 0
+        for event in self.trace:
+            if not self.apply_step(event):
+                continue
+            shown += 1
+            if shown == steps_per_frame:
+                self.render()
+                shown = 0
+                yield self.canvas.buffer_rgba()
+        if shown:
+            self.render()
+            yield self.canvas.buffer_rgba()
+
+    def export(self, path, fps=30, steps_per_frame=1, hold=HOLD_SECONDS):
+        """Encode the run into a GIF or video file
+
+        Args:
+            path (str): Output file; its extension picks the format
+            fps (int): Frames per second of the output
+            steps_per_frame (int): Visible steps coalesced into one frame
+            hold (float): Seconds to keep showing the final state
+
+        Returns:
+            int: Number of frames written
+        """
+        writer = open_writer(path, self.size, fps)
+        try:
+            for buffer in self.frames(steps_per_frame):
+                writer.write(buffer)
+            # Nothing is drawn after the last frame, so its buffer is still valid
+            hold_frames = int(hold * fps)
+            if hold_frames > 0:
+                writer.write(buffer, repeat=hold_frames)
+        finally:
+            writer.close()
+        return writer.frames
+
+
+class SortExporter(ArrayPlayback, Exporter):
+    """Exports a sorting run as a bar chart"""
+
+    def __init__(self, algorithm, data, title=None, figsize=(8, 6), dpi=100):
+        super().__init__(record_sort(algorithm, data), figsize, dpi)
+        self.set_array(data)
+        title = title or algorithm.replace('_', ' ').title()
+        self.renderer = self.make_renderer(self.ax, self.canvas, title)
+        self.renderer.reset(self.array, self.states)
+
+
+class TraversalExporter(TreePlayback, Exporter):
+    """Exports a tree traversal as a node-link diagram"""
+
+    def __init__(self, algorithm, tree, title=None, figsize=(8, 6), dpi=100):
+        super().__init__(record_traversal(algorithm, tree), figsize, dpi)
+        from visualization.tree_renderer import TreeRenderer
+
+        self.tree = tree
+        self.reset_colors()
+        xs, ys, spacing = tree.layout()
+        title = title or algorithm.replace('_', ' ').title()
+        self.renderer = TreeRenderer(self.ax, self.canvas, title)
+        self.renderer.reset(list(zip(xs, ys)), tree.parent, self.node_labels(),
+                            self.node_colors, self.edge_colors, min(0.05, 0.45 * spacing))
+
+
+def steps_for_length(trace, fps, seconds, hidden_ops=frozenset()):
+    """Steps per frame that make a run last about the given number of seconds
+
+    Args:
+        trace (Trace): Run to export
+        fps (int): Frames per second of the output
+        seconds (float): Target length
+        hidden_ops (set): Ops that draw nothing and so take no frame time,
+            as in the playback's hidden_ops
+    """
+    if seconds <= 0:
+        return 1
+    counts = trace.counts()
+    visible = len(trace) - sum(counts[OP_NAMES[op]] for op in hidden_ops)
+    return max(1, math.ceil(visible / (fps * seconds)))
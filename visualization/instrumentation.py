@@ -0,0 +1,154 @@
+"""Timing and operation counters for the playback loop.
+
+FrameStats records where every frame's time goes and how many operations
+have been replayed; StatsOverlay shows the latest numbers on the canvas.
+Both cost nothing while the stats are switched off, because the visualizer
+only creates them on demand.
+"""
+import csv
+import time
+from collections import deque
+
+from algorithms.steps import COMPARE, SWAP, SHIFT, WRITE, BLOCK_SHIFT, OP_NAMES
+
+# Parts of a frame, in the order they happen
+PHASES = ('step', 'update', 'draw', 'log', 'idle')
+
+# Seconds over which the achieved step rate is averaged
+RATE_WINDOW = 1.0
+
+
+class FrameStats:
+    """Per-frame timings of the playback loop and live operation counters
+
+    Every frame is split into the time spent applying steps ("step"),
+    updating artists ("update"), drawing and blitting ("draw"), writing the
+    log ("log") and waiting for the next tick ("idle").
+
+    Attributes:
+        counts (list): Events replayed so far, indexed by op code
+        frames (deque): One row per frame, as dicts keyed by FIELDS
+        last (dict): Most recent row, or None before the first frame
+    """
+
+    FIELDS = (['time', 'steps', 'requested_rate', 'achieved_rate'] +
+              [f"{phase}_ms" for phase in PHASES] +
+              ['comparisons', 'swaps', 'writes'])
+
+    def __init__(self, max_frames=100000):
+        self.frames = deque(maxlen=max_frames)
+        self.counts = [0] * len(OP_NAMES)
+        self.started = time.perf_counter()
+        self.recent = deque()   # (time, steps) of the frames in RATE_WINDOW
+        self.recent_steps = 0
+        self.last = None
+
+    def reset_counts(self):
+        """Start counting operations from zero, for a new run"""
+        self.counts = [0] * len(OP_NAMES)
+
+    def count_trace(self, trace, position):
+        """Set the counters to the events of a trace before position"""
+        import numpy as np
+
+        ops = np.asarray(trace.ops[:position], dtype=np.uint8)
+        self.counts = np.bincount(ops, minlength=len(OP_NAMES)).tolist()
+
+    def record(self, steps, requested_rate, phases):
+        """Add a frame
+
+        Args:
+            steps (int): Visible steps shown by the frame
+            requested_rate (float): Steps per second asked for; inf for instant
+            phases (dict): Seconds spent in each of PHASES
+        """
+        now = time.perf_counter()
+        self.recent.append((now, steps))
+        self.recent_steps += steps
+        while now - self.recent[0][0] > RATE_WINDOW:
+            self.recent_steps -= self.recent.popleft()[1]
+        span = now - self.recent[0][0]
+        achieved = self.recent_steps / span if span > 0 else 0.0
+
+        counts = self.counts
+        row = {
+            'time': round(now - self.started, 4),
+            'steps': steps,
+            'requested_rate': requested_rate,
+            'achieved_rate': round(achieved, 1),
+            'comparisons': counts[COMPARE],
+            'swaps': counts[SWAP],
+            'writes': counts[SHIFT] + counts[WRITE] + counts[BLOCK_SHIFT],
+        }
+        for phase in PHASES:
+            row[f"{phase}_ms"] = round(1000 * phases.get(phase, 0.0), 3)
+        self.frames.append(row)
+        self.last = row
+
+    def summary(self):
+        """Lines describing the latest frame, for the overlay"""
+        row = self.last
+        if row is None:
+            return ["No frames yet"]
+        requested = row['requested_rate']
+        requested = "instant" if requested == float('inf') else f"{requested:.0f}"
+        return [
+            f"steps/s {row['achieved_rate']:>9.0f} of {requested}",
+            "ms      " + " ".join(f"{phase} {row[phase + '_ms']:.1f}" for phase in PHASES),
+            f"cmp {row['comparisons']:>9}  swp {row['swaps']:>9}  wr {row['writes']:>9}",
+        ]
+
+    def save_csv(self, path):
+        """Write every recorded frame as one CSV row"""
+        with open(path, 'w', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=self.FIELDS)
+            writer.writeheader()
+            writer.writerows(self.frames)
+
+
+class StatsOverlay:
+    """Opaque text box in the top-left corner of a figure
+
+    The box is an animated artist outside the figure's own artists, so
+    clearing the figure does not remove it and full redraws leave it out of
+    the renderers' cached backgrounds. Each update draws it over whatever
+    is underneath and blits its extent. Lines are padded to a fixed width
+    so that the box always covers its previous contents.
+    """
+
+    WIDTH = 64
+
+    def __init__(self, canvas):
+        from matplotlib.text import Text
+
+        self.canvas = canvas
+        figure = canvas.figure
+        self.text = Text(0.005, 0.995, "", ha='left', va='top', family='monospace',
+                         fontsize=7, zorder=10, animated=True,
+                         bbox=dict(boxstyle='square', facecolor='white',
+                                   edgecolor='#888888'))
+        self.text.set_figure(figure)
+        self.text.set_transform(figure.transFigure)
+        self.drawn_size = None      # Figure size at the last full draw
+        self._draw_cid = canvas.mpl_connect('draw_event', self._on_draw)
+
+    def show(self, lines):
+        """Replace the text and blit the box"""
+        self.text.set_text("\n".join(line.ljust(self.WIDTH) for line in lines))
+        figure = self.canvas.figure
+        if tuple(figure.bbox.size) != self.drawn_size:
+            # Resized since the last full draw, which will show the text
+            return
+        figure.draw_artist(self.text)
+        self.canvas.blit(self.text.get_bbox_patch().get_window_extent().padded(2))
+
+    def remove(self):
+        """Stop drawing the box and redraw the figure without it"""
+        self.canvas.mpl_disconnect(self._draw_cid)
+        self.canvas.draw()
+
+    def _on_draw(self, event):
+        """Paint the box on top of every full redraw"""
+        figure = self.canvas.figure
+        self.drawn_size = tuple(figure.bbox.size)
+        figure.draw_artist(self.text)
@@ -0,0 +1,180 @@
+import tkinter as tk
+from tkinter import ttk, filedialog
+import tkinter.font as tkFont
+import logging
+import shutil
+import tempfile
+from collections import deque
+
+# Levels offered in the filter box, lowest first
+LEVELS = {
+    'Debug': logging.DEBUG,
+    'Info': logging.INFO,
+    'Warning': logging.WARNING,
+}
+
+
+class LogPanel:
+    """Scrolling algorithm log with a bounded history
+
+    Messages are queued and written to the Text widget in one batch per
+    frame. Only the last max_lines messages are kept in memory and in the
+    widget; the log is also streamed to temporary spool files so it can
+    still be exported. The spool keeps the most recent max_spool_bytes or
+    so: once the current file reaches half of that, the one before it is
+    dropped and a new one is started.
+
+    Messages below the selected level are dropped as they come in, and
+    callers can check enabled() to avoid building them at all. Lowering
+    the level only shows messages logged from then on.
+    """
+
+    def __init__(self, parent, max_lines=1000, max_spool_bytes=64 * 2**20):
+        self.parent = parent
+        self.max_lines = max_lines
+        self.max_spool_bytes = max_spool_bytes
+        self.level = logging.INFO
+
+        # Retained (level, message) pairs and the ones not yet on screen
+        self.lines = deque(maxlen=max_lines)
+        self.pending = []
+        self.widget_lines = 0
+        self._after_id = None
+
+        # Recent messages, kept on disk rather than in memory
+        self.spool = tempfile.TemporaryFile('w+', encoding='utf-8')
+        self.previous_spool = None
+        self.spooled = 0    # Characters written to the current spool file
+
+        self.setup_ui()
+
+    def setup_ui(self):
+        """Set up the log header, filter controls and text widget"""
+        log_header_frame = ttk.Frame(self.parent)
+        log_header_frame.pack(fill=tk.X, padx=5, pady=5)
+
+        ttk.Label(log_header_frame, text="Algorithm Log:", font=("Arial", 12, "bold")).pack(anchor=tk.W)
+
+        # Create a custom font for the log text
+        log_font = tkFont.Font(family="Courier", size=11)
+
+        # Use a Frame with scrollbar for the log
+        log_container = ttk.Frame(self.parent)
+        log_container.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+
+        # Create scrollbar first
+        scrollbar = ttk.Scrollbar(log_container)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+
+        # Now create the text widget with the scrollbar
+        self.widget = tk.Text(log_container, wrap=tk.WORD, width=50, height=30,
+                              font=log_font, bg="#f5f5f5", padx=8, pady=8)
+        self.widget.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+
+        # Connect scrollbar to text widget
+        self.widget.config(yscrollcommand=scrollbar.set)
+        scrollbar.config(command=self.widget.yview)
+
+        # Clear and export buttons
+        ttk.Button(log_header_frame, text="Clear Log", command=self.clear).pack(side=tk.RIGHT)
+        ttk.Button(log_header_frame, text="Export...", command=self.ask_export).pack(side=tk.RIGHT, padx=5)
+
+        # Level filter
+        self.level_var = tk.StringVar()
+        level_combo = ttk.Combobox(log_header_frame, textvariable=self.level_var,
+                                   values=tuple(LEVELS), width=8, state='readonly')
+        level_combo.current(list(LEVELS.values()).index(self.level))
+        level_combo.bind('<<ComboboxSelected>>',
+                         lambda event: self.set_level(LEVELS[self.level_var.get()]))
+        level_combo.pack(side=tk.RIGHT)
+        ttk.Label(log_header_frame, text="Level:").pack(side=tk.RIGHT, padx=5)
+
+    def enabled(self, level):
+        """Whether a message at level would be kept"""
+        return level >= self.level
+
+    def write(self, message, level=logging.INFO):
+        """Queue a message; it reaches the widget on the next flush"""
+        if level < self.level:
+            return
+        line = f"{logging.getLevelName(level):<7} {message}\n"
+        self.spool.write(line)
+        self.spooled += len(line)
+        if self.spooled > self.max_spool_bytes // 2:
+            self.rotate_spool()
+        self.lines.append((level, message))
+        self.pending.append(message)
+        if self._after_id is None:
+            self._after_id = self.widget.after_idle(self.flush)
+
+    def rotate_spool(self):
+        """Drop the older spool file and start a new one"""
+        if self.previous_spool is not None:
+            self.previous_spool.close()
+        self.previous_spool = self.spool
+        self.spool = tempfile.TemporaryFile('w+', encoding='utf-8')
+        self.spooled = 0
+
+    def flush(self):
+        """Write all queued messages to the widget in a single insert"""
+        self._after_id = None
+        if not self.pending:
+            return
+
+        # Lines beyond the cap would be trimmed straight away
+        pending = self.pending[-self.max_lines:]
+        self.pending = []
+        self.widget.insert(tk.END, "\n".join(pending) + "\n")
+        self.widget_lines += len(pending)
+
+        # Drop the oldest lines so the widget never outgrows the cap
+        excess = self.widget_lines - self.max_lines
+        if excess > 0:
+            self.widget.delete("1.0", f"{excess + 1}.0")
+            self.widget_lines = self.max_lines
+        self.widget.see(tk.END)
+
+    def set_level(self, level):
+        """Show only retained messages at or above level, and keep only
+        those from now on"""
+        self.level = level
+        self.pending = []
+        self.widget.delete("1.0", tk.END)
+        shown = [message for lvl, message in self.lines if lvl >= level]
+        self.widget_lines = len(shown)
+        if shown:
+            self.widget.insert(tk.END, "\n".join(shown) + "\n")
+            self.widget.see(tk.END)
+
+    def clear(self):
+        """Clear the widget, the retained history and the spooled log"""
+        self.lines.clear()
+        self.pending = []
+        self.widget_lines = 0
+        self.widget.delete("1.0", tk.END)
+        if self.previous_spool is not None:
+            self.previous_spool.close()
+            self.previous_spool = None
+        self.spool.seek(0)
+        self.spool.truncate()
+        self.spooled = 0
+
+    def export(self, path):
+        """Stream the spooled log, including trimmed lines, to a file"""
+        with open(path, 'w', encoding='utf-8') as f:
+            for spool in (self.previous_spool, self.spool):
+                if spool is None:
+                    continue
+                spool.flush()
+                spool.seek(0)
+                shutil.copyfileobj(spool, f)
+                # Keep appending after the exported content
+                spool.seek(0, 2)
+
+    def ask_export(self):
+        """Ask for a file name and export the log to it"""
+        path = filedialog.asksaveasfilename(defaultextension=".txt",
+                                            filetypes=[("Text files", "*.txt"),
+                                                       ("All files", "*.*")])
+        if path:
+            self.export(path)
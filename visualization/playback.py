@@ -0,0 +1,421 @@
+"""Display state of a replayed run, independent of any GUI toolkit.
+
+The mixins here turn step events into bar or node colors and hand the
+changes to a renderer. The Tk tabs and the offline exporter share them, so
+a run looks the same on screen and in an exported video. Classes using them
+provide a renderer, a log(message, level) method and a log_enabled(level)
+method that tells whether a message would be kept, so that per-step
+messages are only formatted when they are.
+
+A Timeline replays a recorded run through one of them and can seek to any
+step, forwards or backwards.
+"""
+import logging
+from array import array
+
+import numpy as np
+
+from algorithms.steps import (COMPARE, SWAP, SHIFT, WRITE, SELECT, SORTED,
+                              BLOCK_SHIFT, VISIT, GO_LEFT, NO_CHILD, THREAD,
+                              UNTHREAD, CLIMB)
+
+
+class ArrayPlayback:
+    """Values and display states of an array being sorted, driven by step
+    events
+
+    Both live in flat buffers allocated once per array: the values in an
+    array('i') and one state code per element in a bytearray, each state
+    indexing PALETTE. A step only writes the few entries it changes, and
+    renderers view the buffers as NumPy arrays without copying them, so
+    colors come from one palette lookup instead of parsing color strings.
+    Python-level reads and writes on these buffers are several times
+    cheaper than on NumPy arrays, which matters at millions of steps.
+
+    Attributes:
+        array (array): Current values, updated by the replayed steps
+        states (bytearray): Current state of every element
+        base_states (bytearray): State each element returns to after a
+            highlight
+        dirty (set): Elements changed since the last render
+    """
+
+    # Element states, indices into PALETTE; DONE marks sorted elements
+    DEFAULT, DONE, CURRENT, COMPARED, MOVED = range(5)
+    PALETTE = ('#CCCCCC', '#00AA00', '#FF7700', '#00AAFF', '#FF0000')
+
+    # States that give way to any other where several elements share a
+    # pixel column, least important first
+    QUIET_STATES = (DONE, DEFAULT)
+
+    # Ops that apply_step draws nothing for; every array step is shown
+    hidden_ops = frozenset()
+
+    # Arrays longer than this are drawn as a column image instead of bars
+    LARGE_ARRAY = 1000
+
+    def set_array(self, values):
+        """Take new values and give every element the default state"""
+        self.array = array('i', values)
+        self.reset_colors()
+
+    def reset_colors(self):
+        """Give every element the default state and forget highlights"""
+        n = len(self.array)
+        self.base_states = bytearray(n)
+        self.states = bytearray(n)
+        self.highlighted = []
+        self.dirty = set()
+
+    def make_renderer(self, ax, canvas, title, renderer=None, **kwargs):
+        """Renderer suited to the length of self.array
+
+        Up to LARGE_ARRAY elements every value gets its own bar; longer
+        arrays are aggregated into one image column per pixel, which keeps
+        the drawing cost independent of the array length.
+
+        Args:
+            ax, canvas, title: Passed to the renderer
+            renderer: Current renderer, kept if it is of the right kind and
+                disconnected otherwise
+            **kwargs: Further renderer arguments, such as blit
+        """
+        if len(self.array) > self.LARGE_ARRAY:
+            from visualization.column_renderer import ColumnImageRenderer as kind
+            # Highlights win over plain bars, which win over sorted ones
+            kwargs['quiet_states'] = self.QUIET_STATES
+        else:
+            from visualization.bar_renderer import BarChartRenderer as kind
+            kwargs.pop('quiet_states', None)
+        if type(renderer) is kind:
+            return renderer
+        if renderer is not None:
+            renderer.disconnect()
+        return kind(ax, canvas, self.PALETTE, title, **kwargs)
+
+    def snapshot(self):
+        """Copy of the values and states, for restore"""
+        highlighted = [(i, self.states[i]) for i in self.highlighted]
+        return array('i', self.array), bytes(self.base_states), highlighted
+
+    def diff(self, old, new):
+        """Elements that differ between two snapshots, with their new
+        values and base states, for restore"""
+        old_values, old_base_states, _ = old
+        values, base_states, highlighted = new
+        values = np.frombuffer(values, dtype=np.int32)
+        base_states = np.frombuffer(base_states, dtype=np.uint8)
+        changed = np.flatnonzero(
+            (values != np.frombuffer(old_values, dtype=np.int32)) |
+            (base_states != np.frombuffer(old_base_states, dtype=np.uint8)))
+        return changed, values[changed], base_states[changed], highlighted
+
+    def restore(self, state, changes=()):
+        """Return to the state saved by snapshot, reusing the buffers
+
+        Args:
+            state: Snapshot to return to
+            changes (list): Diffs to apply on top of it, oldest first
+        """
+        values, base_states, highlighted = state
+        self.array[:] = values
+        self.base_states[:] = base_states
+        if changes:
+            array_view = np.frombuffer(self.array, dtype=np.int32)
+            base_view = np.frombuffer(self.base_states, dtype=np.uint8)
+            # The highlights are those of the last diff
+            for changed, new_values, new_base_states, highlighted in changes:
+                array_view[changed] = new_values
+                base_view[changed] = new_base_states
+            del array_view, base_view
+        self.states[:] = self.base_states
+        self.highlighted = []
+        for i, code in highlighted:
+            self.states[i] = code
+            self.highlighted.append(i)
+        self.dirty = set(range(len(self.array)))
+
+    def highlight(self, *changes):
+        """Highlight elements, returning the previous ones to their base state
+
+        Args:
+            *changes: Index and state of every element to highlight, given
+                as index, state, index, state, ...
+        """
+        states, highlighted, dirty = self.states, self.highlighted, self.dirty
+        for i in highlighted:
+            states[i] = self.base_states[i]
+        dirty.update(highlighted)
+        highlighted.clear()
+        for k in range(0, len(changes), 2):
+            i = changes[k]
+            states[i] = changes[k + 1]
+            highlighted.append(i)
+        dirty.update(highlighted)
+
+    def highlight_range(self, lo, hi, state):
+        """Highlight elements lo..hi-1 in one state, like highlight"""
+        self.highlight()
+        self.states[lo:hi] = bytes((state,)) * (hi - lo)
+        self.highlighted.extend(range(lo, hi))
+        self.dirty.update(range(lo, hi))
+
+    def mark_sorted(self, lo, hi):
+        """Mark elements lo..hi-1 sorted for the rest of the run"""
+        run = bytes((self.DONE,)) * (hi - lo)
+        self.base_states[lo:hi] = run
+        for i in self.highlighted:
+            self.states[i] = self.base_states[i]
+        self.states[lo:hi] = run
+        self.dirty.update(self.highlighted)
+        self.dirty.update(range(lo, hi))
+        self.highlighted.clear()
+
+    def apply_step(self, event):
+        op, a, b = event
+        if op == COMPARE:
+            # Highlight bars being compared
+            self.highlight(a, self.CURRENT, b, self.COMPARED)
+            if self.log_enabled(logging.DEBUG):
+                self.log(f"compare {a} and {b}", logging.DEBUG)
+        elif op == SWAP:
+            self.array[a], self.array[b] = self.array[b], self.array[a]
+            self.highlight(a, self.MOVED, b, self.MOVED)  # Red for swapped
+            if self.log_enabled():
+                self.log(f"swap {a} and {b}")
+        elif op == SHIFT:
+            self.array[b] = self.array[a]
+            self.highlight(b, self.MOVED)
+            if self.log_enabled():
+                self.log(f"move {self.array[a]} from {a} to {b}")
+        elif op == WRITE:
+            self.array[a] = b
+            self.highlight(a, self.CURRENT)
+            if self.log_enabled():
+                self.log(f"write {b} at {a}")
+        elif op == BLOCK_SHIFT:
+            self.array[a + 1:b + 1] = self.array[a:b]
+            self.highlight_range(a + 1, b + 1, self.MOVED)
+            if self.log_enabled():
+                self.log(f"move {a}..{b - 1} one place right")
+        elif op == SELECT:
+            self.highlight(a, self.CURRENT)
+        elif op == SORTED:
+            self.mark_sorted(a, b)
+        return True
+
+    def render(self):
+        # Draw only the elements touched since the last frame
+        self.renderer.update(self.array, self.states, self.dirty)
+        self.dirty.clear()
+
+
+class TreePlayback:
+    """Node and edge colors of a tree being traversed, driven by step events
+
+    Attributes:
+        tree (BinaryTree): Tree being traversed
+        trace (Trace): Run being replayed
+        node_colors (list): Current fill color of every node
+        edge_colors (list): Current color of every edge, by child node
+        dirty_nodes, dirty_edges (set): Items changed since the last render
+    """
+
+    DEFAULT_COLOR = '#CCCCCC'
+    VISITED_COLOR = '#FF5C8A'
+
+    # Trees larger than this are drawn without key labels
+    MAX_LABELED_NODES = 63
+
+    # Ops that apply_step draws nothing for
+    hidden_ops = frozenset({NO_CHILD, THREAD, UNTHREAD})
+
+    def reset_colors(self):
+        # Initialize node colors (gray by default); each edge is colored
+        # through the child it leads to
+        self.node_colors = [self.DEFAULT_COLOR] * len(self.tree)
+        self.edge_colors = [self.DEFAULT_COLOR] * len(self.tree)
+        self.dirty_nodes = set()
+        self.dirty_edges = set()
+
+    def snapshot(self):
+        """Copy of the node and edge colors, for restore"""
+        return list(self.node_colors), list(self.edge_colors)
+
+    def restore(self, state):
+        """Return to the state saved by snapshot"""
+        node_colors, edge_colors = state
+        self.node_colors = list(node_colors)
+        self.edge_colors = list(edge_colors)
+        self.dirty_nodes = set(range(len(self.tree)))
+        self.dirty_edges = set(range(len(self.tree)))
+
+    def node_labels(self):
+        """Key shown on every node, or None if the tree is too big for labels"""
+        if len(self.tree) > self.MAX_LABELED_NODES:
+            return None
+        return [str(key) for key in self.tree.keys]
+
+    def apply_step(self, event):
+        op, a, b = event
+        key = self.tree.keys[a]
+        if op == NO_CHILD:
+            side = 'left' if b == 0 else 'right'
+            if self.log_enabled(logging.DEBUG):
+                self.log(f"No {side} child for {key}", logging.DEBUG)
+            return False
+
+        if op == VISIT:
+            if self.log_enabled():
+                self.log(f"Printing {key}")
+        elif op in (THREAD, UNTHREAD):
+            # Threads are not drawn, only logged
+            action = 'Threading' if op == THREAD else 'Removing thread from'
+            if self.log_enabled():
+                self.log(f"{action} {key} to {self.tree.keys[b]}")
+            return False
+        elif op == CLIMB:
+            if self.log_enabled():
+                self.log(f"Following thread from {key} back to {self.tree.keys[b]}")
+            a = b
+        elif self.trace.algorithm == 'levelorder':
+            side = 'left' if op == GO_LEFT else 'right'
+            if self.log_enabled():
+                self.log(f"Queueing {side} child {self.tree.keys[b]} of {key}")
+            self.edge_colors[b] = self.VISITED_COLOR
+            self.dirty_edges.add(b)
+        else:
+            side = 'left' if op == GO_LEFT else 'right'
+            if self.log_enabled():
+                self.log(f"Going {side} from {key}")
+            # Highlight the edge being followed
+            self.edge_colors[b] = self.VISITED_COLOR
+            self.dirty_edges.add(b)
+
+        # Highlight the current node
+        self.node_colors[a] = self.VISITED_COLOR
+        self.dirty_nodes.add(a)
+        return True
+
+    def render(self):
+        # Only the nodes and edges touched since the last frame are redrawn
+        self.renderer.update(self.node_colors, self.edge_colors,
+                             self.dirty_nodes, self.dirty_edges)
+        self.dirty_nodes.clear()
+        self.dirty_edges.clear()
+
+
+class Timeline:
+    """Seekable replay of a recorded run through a playback object
+
+    A checkpoint of the playback state is kept every `interval` events. To
+    show step i the nearest checkpoint at or before i is restored and the
+    events after it are applied again, so a seek never replays more than
+    one interval however long the run is. Checkpoints are taken the first
+    time playback passes them. The interval follows the size of the input,
+    since a checkpoint costs about as much as replaying that many events,
+    within [min_interval, max_interval].
+
+    Where the playback can diff two snapshots, as ArrayPlayback can, a
+    checkpoint only stores what changed since the one before, and a full
+    snapshot is taken again once the stored changes add up to the size of
+    the state. Checkpoints then take memory in proportion to the changes
+    of the run rather than its length times the array size, and restoring
+    one copies at most about two states' worth of data.
+
+    Args:
+        playback: ArrayPlayback or TreePlayback whose state is replayed;
+            its current state is taken as the state before the first event
+        trace (Trace): Recorded run
+        min_interval, max_interval (int): Bounds on the events between two
+            checkpoints
+    """
+
+    MIN_INTERVAL = 1024
+    MAX_INTERVAL = 16384
+
+    def __init__(self, playback, trace, min_interval=MIN_INTERVAL,
+                 max_interval=MAX_INTERVAL):
+        self.playback = playback
+        self.trace = trace
+        self.interval = min(max(min_interval, len(trace.data)), max_interval)
+        self.position = 0
+        # Each checkpoint is (True, snapshot) or (False, diff from the
+        # checkpoint before)
+        self.checkpoints = [(True, playback.snapshot())]
+        self._latest = self.checkpoints[0][1]   # Snapshot at the last checkpoint
+        self._diffed = 0    # Elements in the diffs since the last full snapshot
+
+    def __len__(self):
+        return len(self.trace)
+
+    def _checkpoint(self):
+        """Take the snapshot for the current position if one is due"""
+        if (self.position % self.interval == 0 and
+                self.position // self.interval == len(self.checkpoints)):
+            state = self.playback.snapshot()
+            diff = getattr(self.playback, 'diff', None)
+            if diff is not None:
+                changes = diff(self._latest, state)
+                self._diffed += len(changes[0])
+                if self._diffed <= len(state[0]):
+                    self.checkpoints.append((False, changes))
+                    self._latest = state
+                    return
+            self.checkpoints.append((True, state))
+            self._latest = state
+            self._diffed = 0
+
+    def _restore(self, k):
+        """Bring the playback state to checkpoint k"""
+        full = k
+        while not self.checkpoints[full][0]:
+            full -= 1
+        changes = [diff for _, diff in self.checkpoints[full + 1:k + 1]]
+        if changes:
+            self.playback.restore(self.checkpoints[full][1], changes)
+        else:
+            self.playback.restore(self.checkpoints[full][1])
+
+    def play(self):
+        """Yield the events from the current position on
+
+        The caller applies each event before asking for the next one, as
+        AlgorithmVisualizer.advance does. The generator is only valid until
+        the next seek.
+        """
+        for event in self.trace.events(self.position):
+            self._checkpoint()
+            self.position += 1
+            yield event
+
+    def seek(self, position):
+        """Bring the playback state to just after `position` events
+
+        Args:
+            position (int): Number of events applied, clamped to the run
+        """
+        position = max(0, min(position, len(self.trace)))
+        k = min(position // self.interval, len(self.checkpoints) - 1)
+        start = k * self.interval
+        if not start <= self.position <= position:
+            self._restore(k)
+            self.position = start
+        apply_step = self.playback.apply_step
+        for event in self.trace.events(self.position, position):
+            self._checkpoint()
+            apply_step(event)
+            self.position += 1
+
+    def previous_step(self):
+        """Position just after the visible step before the one shown now"""
+        hidden = self.playback.hidden_ops
+        ops = self.trace.ops
+        i = self.position - 1
+        # Skip back to the step on screen, then to the one before it
+        while i >= 0 and ops[i] in hidden:
+            i -= 1
+        i -= 1
+        while i >= 0 and ops[i] in hidden:
+            i -= 1
+        return i + 1
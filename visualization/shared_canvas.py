@@ -0,0 +1,98 @@
+import tkinter as tk
+
+
+class SharedCanvas:
+    """The one matplotlib canvas of a window, lent to one tab at a time
+
+    Every tab builds its own Figure, which only holds artists. The canvas,
+    with its Tk widget, photo image and Agg render buffer, exists once per
+    window: the selected tab's figure is attached to it and its widget is
+    packed into that tab's frame. Switching tabs swaps the figure instead
+    of mapping another canvas, so hidden tabs keep no pixel buffers.
+
+    matplotlib keeps the callbacks connected through a canvas on the
+    figure, so each tab's draw_event handlers move with its figure.
+
+    Args:
+        master: Toplevel window holding every tab
+    """
+
+    # Canvas of every window, by Tk path name
+    instances = {}
+
+    # Milliseconds the widget size must stay put before the figure follows
+    RESIZE_DELAY = 150
+
+    @classmethod
+    def of(cls, widget):
+        """Shared canvas of the window holding widget, created on first use"""
+        toplevel = widget.winfo_toplevel()
+        key = str(toplevel)
+        if key not in cls.instances:
+            cls.instances[key] = cls(toplevel)
+        return cls.instances[key]
+
+    def __init__(self, master):
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+
+        self.canvas = FigureCanvasTkAgg(Figure(), master=master)
+        self.widget = self.canvas.get_tk_widget()
+
+        # Replace the canvas' own resize handler, which redraws the whole
+        # figure on every configure event, with a debounced one
+        self._resize_event = None
+        self._resize_id = None
+        self.widget.bind("<Configure>", self.on_configure)
+
+    def on_configure(self, event):
+        """Remember the new widget size and resize once it stops changing
+
+        Dragging a sash or a window border sends a stream of configure
+        events. Until they settle, the canvas keeps its old size and
+        playback goes on blitting into it; the figure is then resized and
+        redrawn once, which also caches the renderers' new backgrounds.
+        """
+        self._resize_event = event
+        if self._resize_id is not None:
+            self.widget.after_cancel(self._resize_id)
+        self._resize_id = self.widget.after(self.RESIZE_DELAY, self.apply_resize)
+
+    def apply_resize(self):
+        """Resize the figure to the last reported widget size and redraw it"""
+        self._resize_id = None
+        self.canvas.resize(self._resize_event)
+
+    def new_figure(self, figsize=(8, 6)):
+        """Figure for a tab, made without pyplot so that nothing but the tab
+        keeps it alive"""
+        from matplotlib.figure import Figure
+
+        return Figure(figsize=figsize)
+
+    def attach(self, figure, container):
+        """Show figure in container, taking the canvas from the previous tab
+
+        The figure is resized to the widget but not drawn; the caller
+        redraws once its artists are up to date.
+
+        Args:
+            figure (Figure): Figure of the tab being shown
+            container: Frame of that tab to pack the canvas widget into
+
+        Returns:
+            FigureCanvasTkAgg: The shared canvas
+        """
+        canvas = self.canvas
+        if canvas.figure is not figure:
+            canvas.figure = figure
+            figure.set_canvas(canvas)
+
+        # The widget belongs to the toplevel, so it can be packed into any
+        # tab; raising it keeps it above the notebook it is shown in
+        self.widget.pack(in_=container, fill=tk.BOTH, expand=True)
+        self.widget.lift()
+        width, height = self.widget.winfo_width(), self.widget.winfo_height()
+        if width > 1 and height > 1:
+            figure.set_size_inches(width / figure.dpi, height / figure.dpi, forward=False)
+        return canvas
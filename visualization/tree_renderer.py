@@ -0,0 +1,214 @@
+import time
+
+import numpy as np
+from matplotlib.collections import EllipseCollection, LineCollection
+from matplotlib.colors import to_rgba, to_rgba_array
+from matplotlib.transforms import Bbox
+
+from visualization.blit_renderer import BlitRenderer
+
+
+class TreeRenderer(BlitRenderer):
+    """Draws a binary tree with one collection for all edges and one for all
+    nodes, built once per tree.
+
+    Like BarChartRenderer, the axes are rendered into a cached background
+    and the tree artists are animated. A step only changes entries of the
+    color arrays; the region around the changed nodes and edges is then
+    restored from the background, the few nodes and edges overlapping it
+    are redrawn clipped to it, and the region is blitted. The cost of a step
+    therefore depends on what changed, not on the size of the tree. Trees
+    small enough to carry key labels are redrawn whole instead.
+
+    Args:
+        ax: Axes to draw in
+        canvas: Canvas of the axes
+        title (str): Axes title
+        blit (bool): Blit changes right away, or collect them in blit_boxes
+    """
+
+    # Extra pixels around a dirty region for line widths and antialiasing
+    PAD = 3
+
+    def __init__(self, ax, canvas, title="", blit=True):
+        super().__init__(ax, canvas, title, blit)
+        self.nodes = None
+
+    def reset(self, positions, parents, labels, node_colors, edge_colors, radius):
+        """Build the collections for a new tree and redraw everything
+
+        Args:
+            positions (list): (x, y) of every node in axes data coordinates
+            parents (list): Parent index of every node, -1 for the root
+            labels (list): Text drawn on every node, or None for no labels
+            node_colors (list): Fill color of every node
+            edge_colors (list): Color of every edge, indexed by its child node
+            radius (float): Node radius in x data units
+        """
+        self.ax.clear()
+        self.ax.set_xlim(0, 1)
+        self.ax.set_ylim(0, 1)
+        self.ax.set_title(self.title)
+        self.ax.axis('off')
+
+        n = len(positions)
+        self.positions = np.array(positions, dtype=float).reshape(n, 2)
+        parents = np.asarray(parents, dtype=int)
+
+        # Edges are indexed by their child node; the root's is never drawn
+        self.has_edge = parents >= 0
+        children = np.flatnonzero(self.has_edge)
+        self.segments = np.zeros((n, 2, 2))
+        self.segments[children, 0] = self.positions[parents[children]]
+        self.segments[children, 1] = self.positions[children]
+        self.node_rgba = to_rgba_array(node_colors).reshape(n, 4)
+        self.edge_rgba = to_rgba_array(edge_colors).reshape(n, 4)
+
+        # Nodes are sized in x units so they stay round whatever the axes'
+        # aspect; keep them from overlapping vertically on wide axes
+        box = self.ax.bbox
+        radius = min(radius, radius * box.height / box.width) if box.width else radius
+        self.radius = radius
+
+        self.edges = LineCollection(self.segments[children], colors=self.edge_rgba[children],
+                                    linewidths=2, zorder=1, animated=True)
+        self.nodes = self._node_collection(self.positions, self.node_rgba)
+
+        # Partial copies of the two collections, for redrawing a small region
+        self.edge_patch = LineCollection([], linewidths=2, zorder=1, animated=True)
+        self.node_patch = self._node_collection(np.zeros((0, 2)), 'none')
+
+        for collection in (self.edges, self.nodes, self.edge_patch, self.node_patch):
+            # A collection holding a single item is drawn as a pixel-snapped
+            # marker, which would not line up with the same item drawn as
+            # part of the full collection; more than one antialiasing
+            # entry turns that shortcut off
+            collection.set_antialiased([True, True])
+            self.ax.add_collection(collection)
+        self.labels = []
+        if labels is not None:
+            self.labels = [self.ax.text(x, y, label, ha='center', va='center',
+                                        fontweight='bold', color='black', zorder=3,
+                                        animated=True)
+                           for (x, y), label in zip(positions, labels)]
+
+        self.background = None
+        self.canvas.draw()
+
+    def _node_collection(self, offsets, colors):
+        """Circles of the node radius at offsets"""
+        size = np.full(len(offsets), 2 * self.radius)
+        return EllipseCollection(size, size, np.zeros(len(offsets)), units='x',
+                                 offsets=offsets, offset_transform=self.ax.transData,
+                                 facecolors=colors, edgecolors='black', zorder=2,
+                                 animated=True)
+
+    def update(self, node_colors, edge_colors, nodes=(), edges=()):
+        """Recolor the given nodes and edges and blit the area around them
+
+        Args:
+            node_colors (list): Current fill color of every node
+            edge_colors (list): Current color of every edge, by child node
+            nodes (iterable): Nodes whose color may have changed
+            edges (iterable): Edges (by child node) whose color may have changed
+        """
+        if self.nodes is None:
+            return
+        nodes = [i for i in nodes if self._recolor(self.node_rgba, i, node_colors[i])]
+        edges = [i for i in edges
+                 if self.has_edge[i] and self._recolor(self.edge_rgba, i, edge_colors[i])]
+        if not nodes and not edges:
+            return
+        started = time.perf_counter()
+        if self.background is None:
+            self.canvas.draw()
+        elif self.ax.bbox.bounds != self.background_bounds:
+            # The background predates a resize; the pending full redraw
+            # paints the new colors
+            self.canvas.draw_idle()
+        elif self.labels:
+            # Text is not clipped reliably, so small labelled trees are
+            # simply redrawn whole
+            self.canvas.restore_region(self.background)
+            self._draw_tree()
+            self._blit(self.ax.bbox)
+        else:
+            self._blit_region(nodes, edges)
+        self.draw_seconds += time.perf_counter() - started
+
+    def _recolor(self, rgba, i, color):
+        """Store a new color; False if it was already that color"""
+        color = to_rgba(color)
+        if tuple(rgba[i]) == color:
+            return False
+        rgba[i] = color
+        return True
+
+    def _blit_region(self, nodes, edges):
+        """Restore, redraw and blit the box around the given nodes and edges"""
+        # Node radius in data units along each axis; the axes may not be square
+        ax_box = self.ax.bbox
+        r = np.array([self.radius, self.radius * ax_box.width / ax_box.height])
+
+        # Data-space box covering every changed item, grown by a node radius
+        points = np.concatenate([self.positions[nodes].reshape(-1, 2),
+                                 self.segments[edges].reshape(-1, 2)])
+        lo = points.min(axis=0) - r
+        hi = points.max(axis=0) + r
+
+        # Display pixels, clipped to the axes
+        (x1, y1), (x2, y2) = self.ax.transData.transform([lo, hi])
+        x1 = int(max(x1 - self.PAD, ax_box.x0))
+        y1 = int(max(y1 - self.PAD, ax_box.y0))
+        x2 = int(min(x2 + self.PAD, ax_box.x1)) + 1
+        y2 = int(min(y2 + self.PAD, ax_box.y1)) + 1
+        if x2 <= x1 or y2 <= y1:
+            return
+        region = Bbox.from_extents(x1, y1, x2, y2)
+        self._restore_box(x1, y1, x2, y2)
+
+        # Everything that overlaps the region, in data coordinates; outlines
+        # reach a little beyond the node radius
+        to_data = self.ax.transData.inverted().transform
+        pad = self.PAD
+        (dx1, dy1), (dx2, dy2) = to_data([(x1 - pad, y1 - pad), (x2 + pad, y2 + pad)])
+        pos = self.positions
+        near = ((pos[:, 0] + r[0] >= dx1) & (pos[:, 0] - r[0] <= dx2) &
+                (pos[:, 1] + r[1] >= dy1) & (pos[:, 1] - r[1] <= dy2))
+        seg = self.segments
+        crossing = (self.has_edge &
+                    (seg[:, :, 0].max(axis=1) >= dx1) & (seg[:, :, 0].min(axis=1) <= dx2) &
+                    (seg[:, :, 1].max(axis=1) >= dy1) & (seg[:, :, 1].min(axis=1) <= dy2))
+        near, crossing = np.flatnonzero(near), np.flatnonzero(crossing)
+
+        # Redraw them clipped to the region, in the usual order
+        self.edge_patch.set_segments(seg[crossing])
+        self.edge_patch.set_color(self.edge_rgba[crossing])
+        self.node_patch.set_offsets(pos[near].reshape(-1, 2))
+        size = np.full(len(near), 2 * self.radius)
+        self.node_patch.set_widths(size)
+        self.node_patch.set_heights(size)
+        self.node_patch.set_angles(np.zeros(len(near)))
+        self.node_patch.set_facecolor(self.node_rgba[near])
+        for artist in (self.edge_patch, self.node_patch):
+            artist.set_clip_box(region)
+            self.ax.draw_artist(artist)
+
+        self._blit(region)
+
+    def _on_draw(self, event):
+        """Cache the static background after every full draw, then paint the
+        tree on top of it"""
+        if self.nodes is None:
+            return
+        self._save_background()
+        self._draw_tree()
+
+    def _draw_tree(self):
+        """Draw every edge, node and label with the current colors"""
+        self.edges.set_color(self.edge_rgba[self.has_edge])
+        self.nodes.set_facecolor(self.node_rgba)
+        self.ax.draw_artist(self.edges)
+        self.ax.draw_artist(self.nodes)
+        for label in self.labels:
+            self.ax.draw_artist(label)
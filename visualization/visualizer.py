@@ -1,12 +1,96 @@
 import tkinter as tk
-from tkinter import ttk
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-import tkinter.font as tkFont
+from tkinter import ttk, filedialog
+from visualization.log_panel import LogPanel
+import importlib
+import logging
+import math
+import pkgutil
+import time
+from importlib.metadata import entry_points
+
+# Entry point group through which installed packages can add tabs
+PLUGIN_GROUP = 'algorithm_visualizer.tabs'
 
 class AlgorithmVisualizer: 
+    # Subclasses that set a tab title get a tab of their own, placed by
+    # tab_order (lowest first, then by tab_title)
+    tab_title = None
+    tab_order = 100
+    
+    # Every subclass with a tab, by tab title
+    registry = {}
+    
+    # Seconds each visible step stays on screen at speed 1.0
+    step_delay = 0.5
+    
+    # Once steps come faster than this, several are merged into one frame
+    target_fps = 30
+    
+    # Speed slider range, as powers of ten; the top end means "instant"
+    MIN_SPEED_EXP = -1.0
+    MAX_SPEED_EXP = 4.0
+    
+    # Log lines kept in the log widget; older ones are only in exports
+    log_max_lines = 1000
+    
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if 'tab_title' in cls.__dict__ and cls.tab_title:
+            AlgorithmVisualizer.registry[cls.tab_title] = cls
+    
+    @classmethod
+    def discover(cls, package='algorithms'):
+        """Find every visualizer that wants a tab
+        
+        All modules of the package are imported, as are the modules named
+        by PLUGIN_GROUP entry points. Visualizer modules must leave heavy
+        imports such as matplotlib to their constructors, so that
+        discovering a tab costs next to nothing until it is opened.
+        
+        Args:
+            package (str): Package holding the built-in algorithm modules
+        
+        Returns:
+            list: Visualizer classes in tab order
+        """
+        path = importlib.import_module(package).__path__
+        for module in pkgutil.iter_modules(path, package + '.'):
+            importlib.import_module(module.name)
+        try:
+            plugins = entry_points(group=PLUGIN_GROUP)
+        except TypeError:
+            # Python before 3.10 returns a dict of groups
+            plugins = entry_points().get(PLUGIN_GROUP, [])
+        for entry_point in plugins:
+            entry_point.load()
+        return sorted(cls.registry.values(), key=lambda c: (c.tab_order, c.tab_title))
+    
     def __init__(self, parent):
         self.parent = parent
+        
+        # Playback state for the step scheduler
+        self.steps = None
+        self.paused = False
+        self._after_id = None
+        self._step_credit = 0.0
+        self.frame_cost = 0.0
+        
+        # Seekable run being played, if any, and whether log lines are
+        # dropped while a seek replays steps
+        self.timeline = None
+        self.muted = False
+        
+        # Frame timings and counters, only collected while Stats is on
+        self.stats = None
+        self.last_stats = None
+        self.stats_overlay = None
+        self.steps_shown = 0
+        self._tick_ended = None
+        
+        # Tabs draw on one canvas per window, and only while selected
+        self.shared_canvas = None
+        self.visible = True
+        
         self.setup_ui()
         
     def setup_ui(self):
@@ -33,47 +117,45 @@ class AlgorithmVisualizer:
         self.paned_window.add(self.viz_frame, weight=2)  # Visualization gets 2/3 of space
         self.paned_window.add(self.log_frame, weight=1)  # Log gets 1/3 of space
         
-        # Setup log window
-        log_header_frame = ttk.Frame(self.log_frame)
-        log_header_frame.pack(fill=tk.X, padx=5, pady=5)
-        
-        ttk.Label(log_header_frame, text="Algorithm Log:", font=("Arial", 12, "bold")).pack(anchor=tk.W)
-        
-        # Create a custom font for the log text
-        log_font = tkFont.Font(family="Courier", size=11)
-        
-        # Use a Frame with scrollbar for the log
-        log_container = ttk.Frame(self.log_frame)
-        log_container.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
-        
-        # Create scrollbar first
-        scrollbar = ttk.Scrollbar(log_container)
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        # Timeline scrubber under the visualization, packed before the
+        # canvas so the canvas takes the remaining space
+        timeline_frame = ttk.Frame(self.viz_frame)
+        timeline_frame.pack(side=tk.BOTTOM, fill=tk.X, padx=5, pady=5)
+        self.position_var = tk.DoubleVar(value=0)
+        self.scrubber = ttk.Scale(timeline_frame, from_=0, to=1, orient=tk.HORIZONTAL,
+                                  variable=self.position_var, command=self.on_scrub)
+        self.scrubber.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=5)
+        self.position_label = ttk.Label(timeline_frame, width=20)
+        self.position_label.pack(side=tk.RIGHT, padx=5)
         
-        # Now create the text widget with the scrollbar
-        self.log_widget = tk.Text(log_container, wrap=tk.WORD, width=50, height=30, 
-                                font=log_font, bg="#f5f5f5", padx=8, pady=8)
-        self.log_widget.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        # Instrumentation overlay and its CSV export
+        ttk.Button(timeline_frame, text="Save Stats...", 
+                   command=self.ask_export_stats).pack(side=tk.RIGHT, padx=5)
+        self.stats_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(timeline_frame, text="Stats", variable=self.stats_var, 
+                        command=self.toggle_stats).pack(side=tk.RIGHT, padx=5)
         
-        # Connect scrollbar to text widget
-        self.log_widget.config(yscrollcommand=scrollbar.set)
-        scrollbar.config(command=self.log_widget.yview)
-        
-        # Add a clear log button
-        ttk.Button(log_header_frame, text="Clear Log", command=self.clear_log).pack(side=tk.RIGHT)
+        # Setup log window
+        self.log_panel = LogPanel(self.log_frame, self.log_max_lines)
+        self.log_widget = self.log_panel.widget
         
         # Speed control
         speed_frame = ttk.LabelFrame(self.control_frame, text="Animation Speed")
         speed_frame.pack(side=tk.LEFT, padx=10, pady=5)
         
-        self.speed_var = tk.DoubleVar(value=1.0)
-        self.speed_scale = ttk.Scale(speed_frame, from_=0.1, to=3.0, 
-                                   orient=tk.HORIZONTAL, variable=self.speed_var, 
-                                   length=150)
+        # The slider works on a log scale: log10 of the speed multiplier
+        self.speed_var = tk.DoubleVar(value=0.0)
+        self.speed_scale = ttk.Scale(speed_frame, from_=self.MIN_SPEED_EXP, 
+                                   to=self.MAX_SPEED_EXP, orient=tk.HORIZONTAL, 
+                                   variable=self.speed_var, length=150)
         self.speed_scale.pack(side=tk.LEFT, padx=5, pady=5)
         
         ttk.Label(speed_frame, text="Slow").pack(side=tk.LEFT, padx=(0,5))
         ttk.Label(speed_frame, text="Fast").pack(side=tk.RIGHT, padx=(5,0))
+        self.speed_label = ttk.Label(speed_frame, width=8)
+        self.speed_label.pack(side=tk.RIGHT, padx=5)
+        self.speed_var.trace_add('write', lambda *args: self.update_speed_label())
+        self.update_speed_label()
         
         # Common buttons - group them in a frame
         button_frame = ttk.Frame(self.control_frame)
@@ -81,33 +163,341 @@ class AlgorithmVisualizer:
         
         ttk.Button(button_frame, text="Reset", command=self.reset, 
                  width=10).pack(side=tk.LEFT, padx=5, pady=5)
+        ttk.Button(button_frame, text="Back", command=self.step_back, 
+                 width=10).pack(side=tk.LEFT, padx=5, pady=5)
+        ttk.Button(button_frame, text="Step", command=self.step, 
+                 width=10).pack(side=tk.LEFT, padx=5, pady=5)
+        self.pause_button = ttk.Button(button_frame, text="Pause", 
+                                       command=self.toggle_pause, width=10)
+        self.pause_button.pack(side=tk.LEFT, padx=5, pady=5)
         ttk.Button(button_frame, text="Start", command=self.start, 
                  width=10).pack(side=tk.LEFT, padx=5, pady=5)
     
     def setup_canvas(self):
-        """Set up the matplotlib canvas for visualization"""
-        self.fig, self.ax = plt.subplots(figsize=(8, 6))
-        self.canvas = FigureCanvasTkAgg(self.fig, master=self.viz_frame)
-        self.canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+        """Set up the matplotlib figure for visualization
+        
+        The figure is shown on the window's shared canvas, which this tab
+        holds while it is selected.
+        """
+        # matplotlib is slow to import, so it is loaded with the first canvas
+        from visualization.shared_canvas import SharedCanvas
+        
+        self.shared_canvas = SharedCanvas.of(self.viz_frame)
+        self.fig = self.shared_canvas.new_figure()
+        self.ax = self.fig.add_subplot()
+        self.canvas = self.shared_canvas.attach(self.fig, self.viz_frame)
         self.ax.set_title(self.get_title())
         return self.fig, self.ax
     
-    def log(self, message):
-        """Add message to the log widget"""
-        self.log_widget.insert(tk.END, message + "\n")
-        self.log_widget.see(tk.END)
-        self.parent.update()
+    def show(self):
+        """Take the shared canvas back when the tab is selected again and
+        draw what changed while it was hidden"""
+        self.visible = True
+        if self.shared_canvas is None:
+            return
+        self.shared_canvas.attach(self.fig, self.viz_frame)
+        self.canvas.draw()
+        self.update_visualization()
+        if self.stats is not None:
+            self.stats_overlay.show(self.stats.summary())
+    
+    def hide(self):
+        """Stop drawing when another tab is selected
+        
+        Playback keeps running while the tab is hidden, but frames are only
+        applied to the state, not drawn, and the renderer lets go of its
+        cached background until the tab is shown again.
+        """
+        self.visible = False
+        renderer = getattr(self, 'renderer', None)
+        if renderer is not None:
+            renderer.release()
+    
+    def get_speed(self):
+        """Speed multiplier chosen on the slider; math.inf means instant"""
+        exponent = self.speed_var.get()
+        if exponent >= self.MAX_SPEED_EXP:
+            return math.inf
+        return 10 ** exponent
+    
+    def update_speed_label(self):
+        """Show the current speed multiplier next to the slider"""
+        speed = self.get_speed()
+        text = "Instant" if math.isinf(speed) else f"{speed:.3g}x"
+        self.speed_label.config(text=text)
+    
+    def log(self, message, level=logging.INFO):
+        """Queue a message for the log; queued lines are written in one
+        batch once the current frame is done"""
+        if not self.muted:
+            self.log_panel.write(message, level)
+    
+    def log_enabled(self, level=logging.INFO):
+        """Whether a message at level would be logged, so that per-step
+        messages are only formatted when they are kept"""
+        return not self.muted and self.log_panel.enabled(level)
+    
+    def flush_log(self):
+        """Write all queued messages to the log widget"""
+        self.log_panel.flush()
     
     def clear_log(self):
         """Clear log widget"""
-        self.log_widget.delete(1.0, tk.END)
+        self.log_panel.clear()
     
     def get_title(self):
         """Get title for the visualization"""
+        if self.tab_title:
+            return f"{self.tab_title} Visualization"
         return "Algorithm Visualization"
     
+    def run_steps(self, steps):
+        """Play step events (a generator or a recorded trace) back through
+        the Tk event loop"""
+        self.cancel()
+        self.steps = iter(steps)
+        self._step_credit = 0.0
+        if self.stats is not None:
+            self.stats.reset_counts()
+        self.set_paused(False)
+        self._schedule(0)
+    
+    def play_timeline(self, timeline):
+        """Play a recorded run back through a Timeline, so that it can be
+        scrubbed and stepped backwards"""
+        self.timeline = timeline
+        self.scrubber.config(to=max(len(timeline), 1))
+        self.run_steps(timeline.play())
+    
+    def seek(self, position):
+        """Pause playback and show the run as it was after position events"""
+        if self.timeline is None:
+            return
+        self.set_paused(True)
+        self.muted = True
+        try:
+            self.timeline.seek(position)
+        finally:
+            self.muted = False
+        self.steps = self.timeline.play()
+        if self.stats is not None:
+            self.stats.count_trace(self.timeline.trace, self.timeline.position)
+        self.update_visualization()
+        self.update_position()
+        self.log(f"Moved to step {self.timeline.position} of {len(self.timeline)}")
+        self.flush_log()
+    
+    def on_scrub(self, value):
+        """Seek to where the scrubber was dragged"""
+        position = int(float(value))
+        if self.timeline is not None and position != self.timeline.position:
+            self.seek(position)
+    
+    def step_back(self):
+        """Pause playback and go back to the previous visible step"""
+        if self.timeline is not None:
+            self.seek(self.timeline.previous_step())
+    
+    def update_position(self):
+        """Move the scrubber to the current step"""
+        if self.timeline is None:
+            self.position_var.set(0)
+            self.position_label.config(text="")
+            return
+        self.position_var.set(self.timeline.position)
+        self.position_label.config(text=f"Step {self.timeline.position} / {len(self.timeline)}")
+    
+    def _schedule(self, delay):
+        """Schedule the next playback tick after delay milliseconds"""
+        self._after_id = self.parent.after(delay, self._tick)
+    
+    def _tick(self):
+        """Show one frame, then schedule the next one
+        
+        When the requested step rate is higher than the display can keep
+        up with, several steps are applied before the frame is drawn. The
+        frame period adapts to the measured cost of recent frames.
+        """
+        self._after_id = None
+        started = time.perf_counter()
+        idle = started - self._tick_ended if self._tick_ended is not None else 0.0
+        shown_before = self.steps_shown
+        rate = self.get_speed() / self.step_delay  # Requested steps per second
+        frame = max(1.0 / self.target_fps, self.frame_cost)
+        
+        if math.isinf(rate):
+            # Instant: apply as many steps as fit in one frame
+            running = self.advance(None, deadline=started + frame)
+            interval = 0
+        elif rate * frame <= 1:
+            # Slower than the display: one step per frame
+            running = self.advance(1)
+            interval = 1.0 / rate
+        else:
+            # Faster than the display: coalesce steps into one frame
+            self._step_credit += rate * frame
+            count = int(self._step_credit)
+            self._step_credit -= count
+            running = self.advance(count)
+            interval = frame
+        stepped = time.perf_counter()
+        drawn_before = self.draw_time() if self.stats is not None else 0.0
+        if self.visible:
+            self.render()
+        self.update_position()
+        rendered = time.perf_counter()
+        self.flush_log()
+        
+        # Smooth the measured frame cost so one slow frame doesn't stall
+        elapsed = time.perf_counter() - started
+        self.frame_cost = 0.8 * self.frame_cost + 0.2 * elapsed
+        
+        if self.stats is not None:
+            draw = self.draw_time() - drawn_before
+            self.record_frame(self.steps_shown - shown_before, rate, {
+                'step': stepped - started,
+                'update': rendered - stepped - draw,
+                'draw': draw,
+                'log': started + elapsed - rendered,
+                'idle': idle,
+            })
+        
+        # Wait at least 1 ms so Tk's idle tasks (redraws) still get to run
+        self._tick_ended = None
+        if running and not self.paused:
+            self._schedule(max(int(1000 * (interval - elapsed)), 1))
+            self._tick_ended = time.perf_counter()
+    
+    def advance(self, count=1, deadline=None):
+        """Apply events up to and including the next count visible steps
+        
+        Args:
+            count (int): Visible steps to apply, or None for no limit
+            deadline (float): time.perf_counter() value after which to stop
+        
+        Returns:
+            bool: False once the run has finished
+        """
+        if self.steps is None:
+            return False
+        counts = self.stats.counts if self.stats is not None else None
+        shown = 0
+        finished = True
+        for event in self.steps:
+            if counts is not None:
+                counts[event[0]] += 1
+            if not self.apply_step(event):
+                continue
+            shown += 1
+            # Only check the clock every 256 steps
+            if shown == count or (deadline is not None and not shown & 255
+                                  and time.perf_counter() > deadline):
+                finished = False
+                break
+        self.steps_shown += shown
+        if not finished:
+            return True
+        self.steps = None
+        self.set_paused(False)
+        self.on_finished()
+        return False
+    
+    def draw_time(self):
+        """Seconds the renderer has spent drawing and blitting so far"""
+        renderer = getattr(self, 'renderer', None)
+        return renderer.draw_seconds if renderer is not None else 0.0
+    
+    def record_frame(self, steps, rate, phases):
+        """Add a frame to the stats and show them on the canvas"""
+        self.stats.record(steps, rate, phases)
+        if self.visible:
+            self.stats_overlay.show(self.stats.summary())
+    
+    def toggle_stats(self):
+        """Start or stop collecting frame stats, following the Stats box"""
+        from visualization.instrumentation import FrameStats, StatsOverlay
+        
+        if self.stats_var.get():
+            self.stats = FrameStats()
+            if self.timeline is not None:
+                self.stats.count_trace(self.timeline.trace, self.timeline.position)
+            self.stats_overlay = StatsOverlay(self.canvas)
+            self.stats_overlay.show(self.stats.summary())
+        elif self.stats is not None:
+            self.last_stats, self.stats = self.stats, None
+            self.stats_overlay.remove()
+            self.stats_overlay = None
+    
+    def ask_export_stats(self):
+        """Ask for a file name and save the recorded frame stats as CSV"""
+        stats = self.stats or self.last_stats
+        if stats is None:
+            self.log("Tick Stats to record frame timings first", logging.WARNING)
+            self.flush_log()
+            return
+        path = filedialog.asksaveasfilename(defaultextension=".csv", 
+                                            filetypes=[("CSV files", "*.csv"), 
+                                                       ("All files", "*.*")])
+        if path:
+            stats.save_csv(path)
+            self.log(f"Saved {len(stats.frames)} frames of stats to {path}")
+            self.flush_log()
+    
+    def step(self):
+        """Pause playback and advance a single step"""
+        if self.steps is None:
+            self.start()
+        self.set_paused(True)
+        self.advance()
+        self.render()
+        self.update_position()
+    
+    def toggle_pause(self):
+        """Pause a running playback or resume a paused one"""
+        if self.steps is None:
+            return
+        self.set_paused(not self.paused)
+        if not self.paused:
+            self._schedule(0)
+    
+    def set_paused(self, paused):
+        """Stop or allow scheduled ticks and update the pause button"""
+        self.paused = paused
+        if paused and self._after_id is not None:
+            self.parent.after_cancel(self._after_id)
+            self._after_id = None
+        self.pause_button.config(text="Resume" if paused else "Pause")
+    
+    def cancel(self):
+        """Abandon the current run, if any"""
+        if self._after_id is not None:
+            self.parent.after_cancel(self._after_id)
+            self._after_id = None
+        self.steps = None
+        self.set_paused(False)
+    
+    def apply_step(self, event):
+        """Apply a step event to the displayed state without drawing it
+        
+        Returns:
+            bool: True if the step changed the display and should be held
+                on screen, False to move straight on to the next event
+        """
+        return True
+    
+    def render(self):
+        """Draw the changes made by the steps applied since the last frame"""
+        self.update_visualization()
+    
+    def on_finished(self):
+        """Called once the current run has produced its last event"""
+        pass
+    
     def reset(self):
         """Reset visualization"""
+        self.cancel()
+        self.timeline = None
+        self.update_position()
         self.clear_log()
         self.setup_data()
         self.update_visualization()